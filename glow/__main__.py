@@ -1,9 +1,32 @@
-from .glow import Glow
+import sys
+
+from .glow import Glow, integrations
 
 
 def main():
+    # Imported on use, to keep subprocess and socketserver out of the
+    # import time
+    if sys.argv[1:2] == ["multi"]:
+        from .glow import multi
+
+        multi.main(sys.argv[2:])
+
+    from .glow import daemon
+
+    if sys.argv[1:2] != ["daemon"]:
+        exit_code = daemon.forward(sys.argv[1:])
+
+        if exit_code is not None:
+            sys.exit(exit_code)
+
     glow = Glow()
-    glow.main()
+
+    try:
+        glow.main()
+
+    finally:
+        # Close pooled Github connections, of the daemon too once stopped
+        integrations.close_clients()
 
 
 if __name__ == "__main__":
@@ -1,54 +1,322 @@
 import errno
 import os
 import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
 
-import colorama
-from git import Repo
-from git.exc import InvalidGitRepositoryError
-import semver
+from . import helpers, integrations, journals, messages, validators
+from .notes import ReleaseNotes
 
-from . import helpers, integrations, messages, validators
+
+CONFIG_OPTIONS = (
+    "github-token",
+    "github-repository-name",
+    "jira-project-key",
+)
+
+CONFIG_DEFAULTS = {
+    "remote-ref-snapshot": False,
+    "annotated-tags": False,
+    "fetch-strategy": "full",
+    "fetch-depth": 50,
+    "github-api": "rest",
+}
+
+REMOTE_COMMANDS = ("finish_release", "finish_hotfix")
+
+JOURNALED_STEPS = {
+    "finish_feature": "_feature_steps",
+    "finish_release": "_release_steps",
+    "finish_hotfix": "_release_steps",
+}
 
 
 class Glow(object):
 
-    version = "0.0.0"
+    initial_version = "0.0.0"
 
     main_branch = "master"
     develop_branch = "develop"
     remote_name = "origin"
 
-    repo = None
-    config = None
+    _repo = None
+    _config = None
+    _version = None
+    _remote_refs = None
+    _remote_refs_lock = threading.Lock()
+    _remote_states = None
+    _local_branches = None
+
+    dry_run = False
+    older_than = None
+    remote = False
 
     current_directory = None
     working_directory = None
     git_directory = None
 
-    jira_project_key = None
-    github_repository_name = None
-    github_token = None
+    @property
+    def repo(self):
+        if self._repo is None:
+            self._init_repo()
+        return self._repo
+
+    @property
+    def glow_directory(self):
+        return os.path.join(self.repo.git_dir, "glow")
+
+    @property
+    def config(self):
+        if self._config is None:
+            self._init_glow()
+        return self._config
+
+    @property
+    def version(self):
+        if self._version is None:
+            self._init_version()
+        return self._version
+
+    @property
+    def jira_project_key(self):
+        return self.config["jira-project-key"]
+
+    @property
+    def github_repository_name(self):
+        return self.config["github-repository-name"]
+
+    @property
+    def github_token(self):
+        return self.config["github-token"]
 
     def _branches(self):
-        return [branch.name for branch in self.repo.branches]
+        """Local branch names, loaded once until glow creates or deletes one"""
+        if self._local_branches is None:
+            self._local_branches = helpers.read_local_branches(
+                self.repo.common_dir
+            )
+        return self._local_branches
 
     def _branch_exists(self, branch_name):
         return branch_name in self._branches()
 
+    def _reset(self):
+        """Forget state derived from refs and config, e.g. once changed"""
+        self._config = None
+        self._version = None
+        self._remote_refs = None
+        self._remote_states = None
+        self._local_branches = None
+
+    def _is_checked_out(self, branch_name):
+        head = self.repo.head
+        return not head.is_detached and head.ref.name == branch_name
+
     def _change_branch(self, branch_name):
         return self.repo.git.checkout(branch_name)
 
-    def _rebase_branch(self, branch_name):
-        return self.repo.git.rebase(branch_name)
+    def _leave_branches(self, *branch_names):
+        """Switch to develop if one of branch_names is checked out"""
+        if any(self._is_checked_out(name) for name in branch_names):
+            self._change_branch(self.develop_branch)
 
-    def _pull_branch(self, branch_name, create=False):
-        if create:
-            self.repo.git.checkout("-b", branch_name)
+    @contextmanager
+    def _worktree(self, branch_name):
+        """Check out branch_name in a temporary worktree, yield its git"""
+        path = tempfile.mkdtemp(prefix="glow-")
+        self.repo.git.worktree("add", path, branch_name)
+
+        try:
+            yield type(self.repo.git)(path)
+
+        finally:
+            self.repo.git.worktree("remove", "--force", path)
+
+    def _conflicting_paths(self, branch_name, upstream_branch_name):
+        """Predict paths conflicting between two branches, in memory
+
+        Relies on merge-tree --write-tree (git 2.38+), which touches neither
+        the index nor the working tree. Older gits predict no conflict.
+        """
+        status, output, _ = self.repo.git.merge_tree(
+            "--write-tree",
+            "--name-only",
+            "--no-messages",
+            upstream_branch_name,
+            branch_name,
+            with_extended_output=True,
+            with_exceptions=False,
+        )
+
+        if status != 1:
+            return []
+
+        return sorted(set(path for path in output.splitlines()[1:] if path))
+
+    def _can_rebase_branch(self, branch_name, upstream_branch_name):
+        conflicting_paths = self._conflicting_paths(
+            branch_name, upstream_branch_name
+        )
+
+        if conflicting_paths:
+            messages.error(
+                "«{}» conflicts with «{}», rebase it manually:".format(
+                    branch_name, upstream_branch_name
+                )
+            )
+            for path in conflicting_paths:
+                messages.error("  {}".format(path))
+
+        return not conflicting_paths
+
+    def _rebase_branch(self, branch_name, upstream_branch_name):
+        """Rebase branch_name, aborted when a commit fails to apply
+
+        merge-tree predicts conflicts of the merge, not of replaying each
+        commit, so a rebase can still fail once _can_rebase_branch passed.
+        """
+        if self._is_checked_out(branch_name):
+            return self._rebase(
+                self.repo.git, branch_name, upstream_branch_name
+            )
+
+        with self._worktree(branch_name) as git:
+            return self._rebase(git, branch_name, upstream_branch_name)
+
+    def _rebase(self, git, branch_name, upstream_branch_name):
+        from git.exc import GitCommandError
+
+        try:
+            git.rebase(upstream_branch_name)
+
+        except GitCommandError:
+            git.rebase("--abort", with_exceptions=False)
+            messages.error(
+                "«{}» can't be rebased on «{}», rebase it manually.".format(
+                    branch_name, upstream_branch_name
+                )
+            )
+            return False
+
+        return True
+
+    def _merge_branch(self, branch_name, target_branch_name):
+        """Merge branch_name into target_branch_name with a merge commit
+
+        When the target isn't checked out, the merge is computed in memory
+        with merge-tree and falls back on a temporary worktree.
+        """
+        from git.exc import GitCommandError
+
+        if self._is_checked_out(target_branch_name):
+            return self.repo.git.merge("--no-ff", branch_name)
+
+        target_sha = self.repo.git.rev_parse(target_branch_name)
+
+        try:
+            tree_sha = self.repo.git.merge_tree(
+                "--write-tree", target_branch_name, branch_name
+            ).splitlines()[0]
+
+        except GitCommandError:
+            with self._worktree(target_branch_name) as git:
+                return git.merge("--no-ff", branch_name)
+
+        commit_sha = self.repo.git.commit_tree(
+            tree_sha,
+            "-p",
+            target_sha,
+            "-p",
+            branch_name,
+            "-m",
+            "Merge branch '{}' into {}".format(branch_name, target_branch_name),
+        )
+        return self.repo.git.update_ref(
+            "refs/heads/{}".format(target_branch_name), commit_sha, target_sha
+        )
+
+    def _fetch_options(self):
+        fetch_strategy = validators.validate_fetch_strategy(
+            self.config["fetch-strategy"]
+        )
+
+        if fetch_strategy == "blobless":
+            return ["--filter=blob:none"]
+
+        elif fetch_strategy == "shallow":
+            return ["--depth={}".format(self.config["fetch-depth"])]
+
+        return []
+
+    def _fetch(self, *refspecs):
+        options = self._fetch_options()
+
+        try:
+            return self.repo.git.fetch(*options, self.remote_name, *refspecs)
+
+        finally:
+            # Fetching into a local branch creates it when missing
+            self._local_branches = None
+
+    def _merge_remote_branch(self, branch_name):
+        self._fetch(
+            "+{0}:refs/remotes/{1}/{0}".format(branch_name, self.remote_name)
+        )
+        self.repo.git.merge("{}/{}".format(self.remote_name, branch_name))
+
+    def _pull_branches(self, *branch_names):
+        """Fast-forward branches from the remote in a single fetch
+
+        Branches that aren't checked out are updated in place by fetching
+        into their ref, leaving the working tree alone. The checked out one
+        is fetched into its remote-tracking ref, then merged.
+        """
+        from git.exc import GitCommandError
+
+        refspecs = []
+        checked_out_branch_name = None
+
+        for branch_name in branch_names:
+            if self._is_checked_out(branch_name):
+                checked_out_branch_name = branch_name
+                refspecs.append(
+                    "+{0}:refs/remotes/{1}/{0}".format(
+                        branch_name, self.remote_name
+                    )
+                )
+
+            else:
+                refspecs.append("{0}:{0}".format(branch_name))
+
+        try:
+            self._fetch(*refspecs)
+
+        except GitCommandError:
+            # A branch diverged, or is checked out in another worktree
+            for branch_name in branch_names:
+                self._change_branch(branch_name)
+                self._merge_remote_branch(branch_name)
 
         else:
-            self.repo.git.checkout(branch_name)
+            if checked_out_branch_name:
+                self.repo.git.merge(
+                    "{}/{}".format(self.remote_name, checked_out_branch_name)
+                )
 
-        self.repo.git.pull(self.remote_name, branch_name)
+        for branch_name in branch_names:
+            messages.success("↓ «{}» pulled.".format(branch_name))
+
+    def _pull_branch(self, branch_name, create=False):
+        """Fast-forward branch_name, with create check it out from remote"""
+        if not create:
+            return self._pull_branches(branch_name)
+
+        self._fetch("{0}:{0}".format(branch_name))
+        self._change_branch(branch_name)
 
         messages.success("↓ «{}» pulled.".format(branch_name))
 
@@ -61,73 +329,289 @@ class Glow(object):
 
         messages.info("↑ «{}» pushed.".format(branch_name))
 
+    def _push_refs(
+        self,
+        branch_names=(),
+        deleted_branch_names=(),
+        tag_names=(),
+        force=False,
+        leases=None,
+    ):
+        """Push branches, branch deletions and tags in one atomic push
+
+        leases maps branches to the SHA they must still have remotely,
+        otherwise nothing is pushed.
+        """
+        refspecs = list(branch_names)
+        refspecs += [":{}".format(name) for name in deleted_branch_names]
+        refspecs += ["refs/tags/{}".format(name) for name in tag_names]
+
+        options = ["--atomic"]
+        if force:
+            options.append("--force")
+
+        for branch_name, commit_sha in (leases or {}).items():
+            options.append(
+                "--force-with-lease={}:{}".format(branch_name, commit_sha)
+            )
+
+        self.repo.git.push(*options, self.remote_name, *refspecs)
+
+        for remote_refs in (self._remote_refs, self._remote_states):
+            if remote_refs is not None:
+                for branch_name in deleted_branch_names:
+                    remote_refs[branch_name] = False
+
+        for branch_name in branch_names:
+            messages.info("↑ «{}» pushed.".format(branch_name))
+
+        for branch_name in deleted_branch_names:
+            messages.info("↑ «{}» deleted remotely.".format(branch_name))
+
+        for tag_name in tag_names:
+            messages.info("↑ tag «{}» pushed.".format(tag_name))
+
+    def _remote_heads(self):
+        with self._remote_refs_lock:
+            if self._remote_refs is None:
+                remote_refs = {}
+                output = self.repo.git.ls_remote("--heads", self.remote_name)
+                for line in output.splitlines():
+                    commit_sha, _, ref = line.partition("\t")
+                    branch_name = ref.replace("refs/heads/", "", 1)
+                    remote_refs[branch_name] = commit_sha
+
+                self._remote_refs = remote_refs
+
+        return self._remote_refs
+
+    def _prefetch(self, branch_names, pull_requests=()):
+        """Fetch remote state of a whole command in one GraphQL query
+
+        Only used when glow.github-api is "graphql"; branches and pull
+        requests left unknown are looked up through the REST API.
+        """
+        self._remote_states = None
+
+        github_api = validators.validate_github_api(self.config["github-api"])
+        if github_api != "graphql":
+            return
+
+        self._remote_states = integrations.repository_state(
+            self.github_token,
+            self.github_repository_name,
+            branch_names,
+            pull_requests,
+        )
+
+    def _open_pull_request(self, source_branch, dest_branch):
+        """URL of the prefetched open pull request, None when unknown"""
+        if self._remote_states is None:
+            return None
+        return self._remote_states.get((source_branch, dest_branch))
+
+    def _remote_branch_exists(self, branch_name):
+        from git.exc import GitCommandError
+
+        if self._remote_states and branch_name in self._remote_states:
+            return self._remote_states[branch_name]
+
+        if self.config["remote-ref-snapshot"] and not self.remote:
+            try:
+                return self._remote_heads().get(branch_name, False)
+
+            except GitCommandError:
+                messages.warning(
+                    "Remote refs unavailable, falling back on Github API"
+                )
+                self.config["remote-ref-snapshot"] = False
+
+        return integrations.branch_exists(
+            self.github_token, self.github_repository_name, branch_name
+        )
+
+    def _remote_lookups(self, *branch_names):
+        """Look up remote branches concurrently, one future per branch"""
+        return [
+            integrations.submit(self._remote_branch_exists, branch_name)
+            for branch_name in branch_names
+        ]
+
+    def _create_remote_branch(self, branch_name, commit_sha):
+        status_code = integrations.create_branch(
+            self.github_token,
+            self.github_repository_name,
+            "refs/heads/{}".format(branch_name),
+            commit_sha,
+        )
+
+        if status_code == 201:
+            for remote_refs in (self._remote_refs, self._remote_states):
+                if remote_refs is not None:
+                    remote_refs[branch_name] = commit_sha
+
+        return status_code
+
     def _tags(self):
+        import semver
+
         versions = []
-        for tag in self.repo.tags:
-            try:
-                versions.append((tag.object.committed_date, tag.name,))
+        output = self.repo.git.for_each_ref(
+            "--sort=creatordate",
+            "--format=%(creatordate:unix) %(refname:strip=2)",
+            "refs/tags",
+        )
+        for line in output.splitlines():
+            tag_date, _, tag_name = line.partition(" ")
+
+            if not semver.VersionInfo.isvalid(tag_name):
+                continue
+
+            versions.append(
+                (
+                    int(tag_date or 0),
+                    semver.VersionInfo.parse(tag_name),
+                    tag_name,
+                )
+            )
+
+        versions.sort(key=lambda _tag: _tag[:2])
+        return [tag_name for tag_date, tag_version, tag_name in versions]
+
+    def _delete_branches(self, *branch_names):
+        self.repo.git.branch("-D", *branch_names)
+        self._local_branches = None
+
+    def _delete_branch_refs(self, branch_shas):
+        """Delete local branches in one ref transaction
 
-            except AttributeError:
-                pass
+        branch_shas maps each branch to its expected SHA, so nothing is
+        deleted if any of them moved meanwhile.
+        """
+        commands = ["start"]
+        commands += [
+            "delete refs/heads/{} {}".format(branch_name, commit_sha)
+            for branch_name, commit_sha in branch_shas.items()
+        ]
+        commands.append("commit")
 
-        versions.sort(key=lambda _tag: _tag[0])
-        return [tag_name for tag_date, tag_name in versions]
+        with tempfile.TemporaryFile() as stdin:
+            stdin.write("\n".join(commands + [""]).encode())
+            stdin.seek(0)
+            self.repo.git.update_ref("--stdin", istream=stdin)
+
+        self._local_branches = None
 
     def _create_tag(self, version, ref=None):
-        if ref:
-            return self.repo.create_tag(version, ref=ref)
-        else:
-            return self.repo.create_tag(version)
+        message = None
+        if self.config["annotated-tags"]:
+            message = "Version {}".format(version)
+
+        return self.repo.create_tag(
+            str(version), ref=ref or "HEAD", message=message
+        )
 
-    def _pull_tags(self):
-        self.repo.git.fetch(self.remote_name, "--tags")
-        messages.success("↓ tags pulled.")
+    def _pull_tags(self, *tag_names):
+        self.repo.git.fetch(
+            self.remote_name,
+            *["refs/tags/{0}:refs/tags/{0}".format(tag) for tag in tag_names]
+        )
+        messages.success("↓ tags {} pulled.".format(", ".join(tag_names)))
 
-    def _push_tags(self):
-        self.repo.git.push(self.remote_name, "--tags")
-        messages.info("↑ tags pushed.")
+    def _push_tags(self, *tag_names):
+        self.repo.git.push(
+            self.remote_name,
+            *["refs/tags/{}".format(tag) for tag in tag_names]
+        )
+        messages.info("↑ tags {} pushed.".format(", ".join(tag_names)))
 
     def _get_changes(self, source_branch, dest_branch):
-        return self.repo.git.log(
-            "{}...{}".format(source_branch, dest_branch), "--pretty=format:%s"
+        subjects = helpers.log_subjects(
+            self.repo.git, "{}...{}".format(source_branch, dest_branch)
         )
+        return helpers.build_changelog(subjects, self.jira_project_key)
 
     def _create_config(self):
-        self.jira_project_key = messages.question("Jira Project Key? ").upper()
-        self.github_repository_name = messages.question(
-            "Github Repository Name? [:owner/:name] "
-        )
-        self.github_token = messages.question("Github Token? ")
+        return {
+            "jira-project-key": messages.question(
+                "Jira Project Key? "
+            ).upper(),
+            "github-repository-name": messages.question(
+                "Github Repository Name? [:owner/:name] "
+            ),
+            "github-token": messages.question("Github Token? "),
+        }
 
     def _init_repo(self):
+        from git.exc import InvalidGitRepositoryError
+
+        from .tracing import TracedRepo
+
         self.current_directory = os.getcwd()
 
         try:
-            self.repo = Repo(
+            repo = TracedRepo(
                 self.current_directory, search_parent_directories=True
             )
-            _ = self.repo.git.rev_parse("--show-toplevel")
-            self.working_directory = self.repo.working_dir
-            self.git_directory = self.repo.git_dir
+            _ = repo.git.rev_parse("--show-toplevel")
+            self.working_directory = repo.working_dir
+            self.git_directory = repo.git_dir
+            self._repo = repo
 
         except InvalidGitRepositoryError:
             messages.critical("You are not in a git repository")
             sys.exit(errno.ENOENT)
 
+    def _environment_config(self):
+        """Configuration of --remote mode, read from GLOW_* variables"""
+
+        def variable(option):
+            return "GLOW_{}".format(option.upper().replace("-", "_"))
+
+        config = {
+            option: os.environ.get(variable(option))
+            for option in CONFIG_OPTIONS
+        }
+        for option, default in CONFIG_DEFAULTS.items():
+            value = os.environ.get(variable(option))
+
+            if value is None:
+                config[option] = default
+            elif isinstance(default, bool):
+                config[option] = helpers.env_flag(variable(option))
+            else:
+                config[option] = type(default)(value)
+
+        missing = [
+            variable(option)
+            for option in ("github-token", "github-repository-name")
+            if not config[option]
+        ]
+        if missing:
+            messages.critical(
+                "--remote requires {} to be set".format(", ".join(missing))
+            )
+            sys.exit(errno.EPERM)
+
+        return config
+
     def _init_glow(self):
+        if self.remote:
+            self._config = self._environment_config()
+            return
+
         with self.repo.config_reader() as config_reader:
             if config_reader.has_section("glow"):
-                # fmt: off
-                self.github_token = config_reader.get(
-                    "glow", "github-token"
-                )
-                self.github_repository_name = config_reader.get(
-                    "glow", "github-repository-name"
-                )
-                self.jira_project_key = config_reader.get(
-                    "glow", "jira-project-key"
-                )
-                # fmt: on
+                config = {
+                    option: config_reader.get("glow", option)
+                    for option in CONFIG_OPTIONS
+                }
+                for option, default in CONFIG_DEFAULTS.items():
+                    config[option] = config_reader.get_value(
+                        "glow", option, default
+                    )
+
+                self._config = config
 
             else:
                 create_a_glow_file = messages.question(
@@ -141,189 +625,661 @@ class Glow(object):
                     sys.exit(errno.EPERM)
 
                 else:
-                    self._create_config()
+                    config = self._create_config()
 
                     with self.repo.config_writer() as config_writer:
-                        # fmt: off
                         config_writer.add_section("glow")
-                        config_writer.set(
-                            "glow",
-                            "github-token",
-                            self.github_token,
-                        )
-                        config_writer.set(
-                            "glow",
-                            "github-repository-name",
-                            self.github_repository_name,
-                        )
-                        config_writer.set(
-                            "glow",
-                            "jira-project-key",
-                            self.jira_project_key,
-                        )
-                        # fmt: on
+                        for option in CONFIG_OPTIONS:
+                            config_writer.set("glow", option, config[option])
+
+                    self._config = dict(CONFIG_DEFAULTS)
+                    self._config.update(config)
 
     def _init_version(self):
+        import semver
+
         tags = self._tags()
 
         if not tags:
-            self.version = semver.VersionInfo.parse(self.version)
+            version = semver.VersionInfo.parse(self.initial_version)
 
             messages.warning("No version found for this repository...")
             first_commit = self.repo.git.rev_list("--max-parents=0", "HEAD")
             messages.warning(
-                "Generate first version «{}» on first commit".format(
-                    self.version
-                )
+                "Generate first version «{}» on first commit".format(version)
             )
 
-            self._create_tag(self.version, first_commit)
+            self._create_tag(version, first_commit)
 
-            self._push_tags()
+            self._push_tags(str(version))
             messages.success(
-                "Version {} pushed to remote repository".format(self.version)
+                "Version {} pushed to remote repository".format(version)
             )
 
         else:
             latest = tags[-1]
-            self.version = semver.VersionInfo.parse(latest)
+            version = semver.VersionInfo.parse(latest)
             messages.log(":label:  Latest version: {}".format(latest))
 
+        self._version = version
+
     def __init__(self):
-        """Initialize Github Flow CLI"""
+        """Initialize Github Flow CLI
+
+        Repository, configuration and version are loaded on first access,
+        once the command has been validated.
+        """
+
+    """ Journaled steps methods """
+
+    def _feature_steps(self, branch_names):
+        return [
+            ("checkout", partial(self._leave_branches, *branch_names)),
+            ("pull", partial(self._pull_branch, self.develop_branch)),
+            ("delete", partial(self._delete_branches, *branch_names)),
+            (
+                "push",
+                partial(self._push_refs, deleted_branch_names=branch_names),
+            ),
+        ]
+
+    def _release_steps(self, branch_name, version):
+        """Steps finishing a release or hotfix branch"""
+        return [
+            ("checkout", partial(self._leave_branches, branch_name)),
+            (
+                "pull",
+                partial(
+                    self._pull_branches, self.main_branch, self.develop_branch
+                ),
+            ),
+            ("tag", partial(self._create_tag, version, ref=self.main_branch)),
+            (
+                "merge",
+                partial(self._merge_branch, branch_name, self.develop_branch),
+            ),
+            ("delete", partial(self._delete_branches, branch_name)),
+            (
+                "push",
+                partial(
+                    self._push_refs,
+                    branch_names=[self.develop_branch],
+                    deleted_branch_names=[branch_name],
+                    tag_names=[version],
+                ),
+            ),
+        ]
+
+    def _run_steps(self, command, **arguments):
+        """Run the steps of command, recording each one in the journal
+
+        Steps recorded by an interrupted run of the same command are
+        skipped, the journal is removed once every step is done.
+        """
+        journal = journals.Journal(self.glow_directory)
+        if journal.entry is None:
+            journal.start(command, arguments)
+
+        for step_name, step in getattr(self, JOURNALED_STEPS[command])(
+            **arguments
+        ):
+            if journal.is_done(step_name):
+                messages.log("Step «{}» already done.".format(step_name))
+                continue
+
+            try:
+                step()
 
-        colorama.init(autoreset=True)
+            except Exception:
+                messages.critical(
+                    "Step «{}» failed, «git glow resume» once fixed.".format(
+                        step_name
+                    )
+                )
+                raise
 
-        self._init_repo()
-        self._init_glow()
-        self._init_version()
+            journal.done(step_name)
 
-    """ Feature methods """
+        journal.clear()
 
-    def start_feature(self, issue_id):
-        issue_id = validators.validate_issue_id(issue_id)
-        feature_name = "{}-{}".format(self.jira_project_key, issue_id)
-        branch_name = "feature/{}".format(feature_name)
+    def _is_interrupted(self):
+        """Whether an interrupted command must be resumed first"""
+        journal = journals.Journal(self.glow_directory)
 
-        if self._branch_exists(branch_name):
-            messages.error("«{}» already exists locally.".format(branch_name))
+        if journal.entry is not None:
+            messages.error(
+                "«{}» was interrupted, run «git glow resume» first.".format(
+                    " ".join(journal.entry["command"].split("_"))
+                )
+            )
+
+        return journal.entry is not None
+
+    def resume(self, action=None):
+        journal = journals.Journal(self.glow_directory)
+
+        if journal.entry is None:
+            messages.warning("Nothing to resume.")
             return False
 
-        if integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
+        command_name = " ".join(journal.entry["command"].split("_"))
+
+        if action == "discard":
+            journal.clear()
+            messages.info("«{}» discarded.".format(command_name))
+            return True
+
+        messages.info("Resume «{}».".format(command_name))
+        self._run_steps(journal.entry["command"], **journal.entry["arguments"])
+        messages.success(":fireworks:  «{}» done.".format(command_name))
+        return True
+
+    """ Feature methods """
+
+    def _feature_names(self, issue_ids):
+        if not issue_ids:
+            validators.validate_issue_id(None)
+
+        feature_names = [
+            "{}-{}".format(
+                self.jira_project_key, validators.validate_issue_id(issue_id)
+            )
+            for issue_id in issue_ids
+        ]
+        return list(OrderedDict.fromkeys(feature_names))
+
+    def _summarize(self, results):
+        """Print the outcome of each branch of a batch, if any"""
+        if len(results) > 1:
+            messages.log("Summary:")
+
+            for branch_name, (succeeded, detail) in results.items():
+                message = "  «{}» {}".format(branch_name, detail)
+
+                if succeeded:
+                    messages.success(message)
+                else:
+                    messages.error(message)
+
+        return all(succeeded for succeeded, _ in results.values())
+
+    def _existing_branch_names(self, branch_names, results):
+        """Branches existing locally and remotely, failures go to results"""
+        local_branch_names = []
+        for branch_name in branch_names:
+            if self._branch_exists(branch_name):
+                local_branch_names.append(branch_name)
+
+            else:
+                messages.error(
+                    "«{}» doesn't exists locally.".format(branch_name)
+                )
+                results[branch_name] = (False, "doesn't exists locally")
+
+        existing_branch_names = []
+        for branch_name, remote_branch in zip(
+            local_branch_names, self._remote_lookups(*local_branch_names)
         ):
-            messages.warning(
-                "«{}» already exists remotely.".format(branch_name)
+            if remote_branch.result():
+                existing_branch_names.append(branch_name)
+
+            else:
+                messages.error(
+                    "«{}» doesn't exists remotely.".format(branch_name)
+                )
+                results[branch_name] = (False, "doesn't exists remotely")
+
+        return existing_branch_names
+
+    def start_feature(self, *issue_ids):
+        branch_names = [
+            "feature/{}".format(feature_name)
+            for feature_name in self._feature_names(issue_ids)
+        ]
+        results = OrderedDict()
+
+        new_branch_names = []
+        for branch_name in branch_names:
+            if self._branch_exists(branch_name):
+                messages.error(
+                    "«{}» already exists locally.".format(branch_name)
+                )
+                results[branch_name] = (False, "already exists locally")
+
+            else:
+                new_branch_names.append(branch_name)
+
+        if not new_branch_names:
+            return self._summarize(results)
+
+        self._prefetch([self.develop_branch] + new_branch_names)
+        develop_sha, *remote_branches = self._remote_lookups(
+            self.develop_branch, *new_branch_names
+        )
+
+        pulled_branch_names = []
+        for branch_name, remote_branch in zip(
+            list(new_branch_names), remote_branches
+        ):
+            if remote_branch.result():
+                messages.warning(
+                    "«{}» already exists remotely.".format(branch_name)
+                )
+                results[branch_name] = (False, "already exists remotely")
+                pulled_branch_names.append(branch_name)
+                new_branch_names.remove(branch_name)
+
+        if new_branch_names:
+            question = "Start feature name: «{}» [y/n] ".format(
+                "», «".join(new_branch_names)
             )
-            self._pull_branch(branch_name, create=True)
+            helpers.ask(question)
+
+            commit_sha = develop_sha.result()
+            status_codes = [
+                integrations.submit(
+                    self._create_remote_branch, branch_name, commit_sha
+                )
+                for branch_name in new_branch_names
+            ]
+
+            for branch_name, status_code in zip(
+                new_branch_names, status_codes
+            ):
+                status_code = status_code.result()
+
+                if status_code == 201:
+                    messages.success(
+                        "«{}» created on Github".format(branch_name)
+                    )
+                    results[branch_name] = (True, "created")
+                    pulled_branch_names.append(branch_name)
+
+                elif status_code == 422:
+                    messages.warning(
+                        "{} already exists on Github.".format(branch_name)
+                    )
+                    results[branch_name] = (True, "already on Github")
+                    pulled_branch_names.append(branch_name)
+
+                else:
+                    messages.critical(
+                        "{} can not be created on Github ({}:).".format(
+                            branch_name,
+                            status_code,
+                        )
+                    )
+                    results[branch_name] = (
+                        False,
+                        "can not be created on Github ({})".format(
+                            status_code
+                        ),
+                    )
+
+        if pulled_branch_names:
+            self._fetch(
+                *[
+                    "{0}:{0}".format(branch_name)
+                    for branch_name in pulled_branch_names
+                ]
+            )
+            for branch_name in pulled_branch_names:
+                messages.success("↓ «{}» pulled.".format(branch_name))
+
+            if len(branch_names) == 1:
+                self._change_branch(pulled_branch_names[0])
+                messages.success(
+                    "Switch to «{}».".format(pulled_branch_names[0])
+                )
+
+        return self._summarize(results)
+
+    def review_feature(self, *issue_ids):
+        feature_names = dict(
+            ("feature/{}".format(feature_name), feature_name)
+            for feature_name in self._feature_names(issue_ids)
+        )
+        results = OrderedDict()
+
+        self._prefetch(
+            list(feature_names),
+            [
+                (branch_name, self.develop_branch)
+                for branch_name in feature_names
+            ],
+        )
+        branch_names = self._existing_branch_names(feature_names, results)
+        if not branch_names:
+            return self._summarize(results)
+
+        self._pull_branch(self.develop_branch)
+
+        rebased_branch_names = []
+        for branch_name in branch_names:
+            if not self._can_rebase_branch(branch_name, self.develop_branch):
+                results[branch_name] = (False, "conflicts with develop")
+                continue
+
+            if not self._rebase_branch(branch_name, self.develop_branch):
+                results[branch_name] = (False, "rebase failed on develop")
+                continue
+
+            rebased_branch_names.append(branch_name)
+
+        if not rebased_branch_names:
+            return self._summarize(results)
+
+        self._push_refs(branch_names=rebased_branch_names, force=True)
+
+        pull_requests = OrderedDict()
+        for branch_name in rebased_branch_names:
+            url = self._open_pull_request(branch_name, self.develop_branch)
+
+            if url:
+                messages.success("PR already open: {}".format(url))
+                results[branch_name] = (True, "in review: {}".format(url))
+
+            else:
+                pull_requests[branch_name] = integrations.submit(
+                    integrations.create_pull_request,
+                    self.github_token,
+                    self.github_repository_name,
+                    branch_name,
+                    self.develop_branch,
+                    feature_names[branch_name],
+                    self._get_changes(branch_name, self.develop_branch),
+                )
+
+        for branch_name, pull_request in pull_requests.items():
+            status_code, response = pull_request.result()
+
+            if status_code == 201:
+                messages.success("New PR created: {}".format(response))
+                results[branch_name] = (True, "in review: {}".format(response))
+
+            else:
+                for error in response:
+                    messages.critical(error)
+                results[branch_name] = (False, "; ".join(response))
+
+        return self._summarize(results)
+
+    def finish_feature(self, *issue_ids):
+        if self._is_interrupted():
             return False
 
-        question = "Start feature name: «{}» [y/n] ".format(branch_name)
-        helpers.ask(question)
+        branch_names = [
+            "feature/{}".format(feature_name)
+            for feature_name in self._feature_names(issue_ids)
+        ]
+        results = OrderedDict()
+
+        self._prefetch(branch_names)
+        branch_names = self._existing_branch_names(branch_names, results)
+        if not branch_names:
+            return self._summarize(results)
 
-        commit_sha = integrations.branch_exists(
-            self.github_token, self.github_repository_name, self.develop_branch
+        self._run_steps("finish_feature", branch_names=branch_names)
+
+        for branch_name in branch_names:
+            messages.success(":fireworks:  «{}» finished.".format(branch_name))
+            results[branch_name] = (True, "finished")
+
+        return self._summarize(results)
+
+    def cancel_feature(self, issue_id):
+        messages.warning("Not implemented yet")
+
+    def _merged_features(self):
+        """Local and remote features merged into develop, {name: SHA} each
+
+        A single for-each-ref --merged walks develop history once for every
+        branch, local and remote-tracking. Features without commits of their
+        own, e.g. just started, are reachable from develop too: their tip is
+        on the first-parent history of develop, unlike merged ones.
+        """
+        remote_prefix = "refs/remotes/{}/".format(self.remote_name)
+        output = self.repo.git.for_each_ref(
+            "--merged={}".format(self.develop_branch),
+            "--format=%(refname) %(objectname) %(committerdate:unix)",
+            "refs/heads/feature/",
+            remote_prefix + "feature/",
         )
-        commit_ref = "refs/heads/{}".format(branch_name)
 
-        status_code = integrations.create_branch(
-            self.github_token,
-            self.github_repository_name,
-            commit_ref,
-            commit_sha,
+        deadline = None
+        if self.older_than is not None:
+            deadline = time.time() - self.older_than * 24 * 3600
+
+        local_features, remote_features = OrderedDict(), OrderedDict()
+        for line in output.splitlines():
+            ref, commit_sha, commit_date = line.split(" ")
+
+            if deadline is not None and int(commit_date) > deadline:
+                continue
+
+            if ref.startswith(remote_prefix):
+                remote_features[ref.replace(remote_prefix, "", 1)] = commit_sha
+            else:
+                local_features[ref.replace("refs/heads/", "", 1)] = commit_sha
+
+        unmerged_shas = self._first_parent_shas(
+            self.develop_branch,
+            set(local_features.values()) | set(remote_features.values()),
         )
 
-        if status_code == 201:
-            messages.success("«{}» created on Github".format(branch_name))
-            self._pull_branch(branch_name, create=True)
-            messages.success("Switch to «{}».".format(branch_name))
-            return True
+        return tuple(
+            OrderedDict(
+                (branch_name, commit_sha)
+                for branch_name, commit_sha in features.items()
+                if commit_sha not in unmerged_shas
+            )
+            for features in (local_features, remote_features)
+        )
 
-        elif status_code == 422:
-            messages.warning("{} already exists on Github.".format(branch_name))
-            self._pull_branch(branch_name)
-            messages.success("Switch to «{}».".format(branch_name))
+    def _first_parent_shas(self, branch_name, commit_shas):
+        """Which of commit_shas are on the first-parent history of a branch"""
+        if not commit_shas:
+            return set()
+
+        process = self.repo.git.rev_list(
+            "--first-parent", branch_name, as_process=True
+        )
+
+        found_shas = set()
+        try:
+            for line in process.stdout:
+                commit_sha = line.decode().strip()
+                if commit_sha in commit_shas:
+                    found_shas.add(commit_sha)
+
+        finally:
+            process.wait()
+
+        return found_shas
+
+    def prune_features(self):
+        self._fetch(
+            "--prune",
+            "+refs/heads/feature/*:refs/remotes/{}/feature/*".format(
+                self.remote_name
+            ),
+        )
+        self._pull_branch(self.develop_branch)
+
+        local_features, remote_features = self._merged_features()
+
+        head = self.repo.head
+        if not head.is_detached and head.ref.name in local_features:
+            messages.warning(
+                "«{}» is checked out, it won't be pruned.".format(
+                    head.ref.name
+                )
+            )
+            del local_features[head.ref.name]
+
+        if not local_features and not remote_features:
+            messages.log("No merged feature to prune.")
             return True
 
-        else:
-            messages.critical(
-                "{} can not be created on Github ({}:).".format(
-                    branch_name,
-                    status_code,
+        for branch_name in sorted(set(local_features) | set(remote_features)):
+            places = [
+                place
+                for place, features in (
+                    ("local", local_features),
+                    (self.remote_name, remote_features),
                 )
+                if branch_name in features
+            ]
+            messages.log("  {} ({})".format(branch_name, ", ".join(places)))
+
+        if self.dry_run:
+            return True
+
+        question = "Prune {} local and {} remote features [y/n] ".format(
+            len(local_features), len(remote_features)
+        )
+        helpers.ask(question)
+
+        if local_features:
+            self._delete_branch_refs(local_features)
+            messages.info(
+                "{} features deleted locally.".format(len(local_features))
             )
-            return False
 
-    def review_feature(self, issue_id):
-        issue_id = validators.validate_issue_id(issue_id)
-        feature_name = "{}-{}".format(self.jira_project_key, issue_id)
-        branch_name = "feature/{}".format(feature_name)
+        if remote_features:
+            self._push_refs(
+                deleted_branch_names=list(remote_features),
+                leases=remote_features,
+            )
 
-        if not self._branch_exists(branch_name):
-            messages.error("«{}» doesn't exists locally.".format(branch_name))
+        messages.success(":broom:  Merged features pruned.")
+        return True
+
+    """ Release methods """
+
+    def _finish_remotely(self, kind):
+        """Tag main, merge the running kind branch into develop, delete it
+
+        Used by --remote, which needs no clone: every step is a Github API
+        call. The version is the one of the running release/ or hotfix/
+        branch, not the next one after the tags, so a rerun after a failure
+        finishes the same branch, skipping the tag and merge already done.
+        """
+        branch_names = integrations.branch_names(
+            self.github_token,
+            self.github_repository_name,
+            "{}/".format(kind),
+        )
+
+        if branch_names is None:
             return False
 
-        if not integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
-            messages.error("«{}» doesn't exists remotely.".format(branch_name))
+        if not branch_names:
+            messages.error("No {} running remotely.".format(kind))
             return False
 
-        self._change_branch(self.develop_branch)
-        self._pull_branch(self.develop_branch)
+        if len(branch_names) > 1:
+            messages.error(
+                "Several {}s running remotely: «{}».".format(
+                    kind, "», «".join(branch_names)
+                )
+            )
+            return False
 
-        self._change_branch(branch_name)
-        self._rebase_branch(self.develop_branch)
-        self._push_branch(branch_name, force=True)
+        branch_name = branch_names[0]
+        version = branch_name.split("/", 1)[1]
+        main_sha = self._remote_branch_exists(self.main_branch)
 
-        changes = self._get_changes(branch_name, self.develop_branch)
+        if not main_sha:
+            messages.critical(
+                "{} branch can not be found on Github.".format(self.main_branch)
+            )
+            return False
 
-        status_code, response = integrations.create_pull_request(
+        message = None
+        if self.config["annotated-tags"]:
+            message = "Version {}".format(version)
+
+        status_code = integrations.create_tag(
             self.github_token,
             self.github_repository_name,
-            branch_name,
-            self.develop_branch,
-            feature_name,
-            changes,
+            version,
+            main_sha,
+            message,
         )
 
         if status_code == 201:
-            messages.success("New PR created: {}".format(response))
-            return True
+            messages.info("Tag «{}» created on Github.".format(version))
+
+        elif status_code == 422:
+            # Also the answer to an invalid payload, so check the tag
+            tag_sha = integrations.tag_commit(
+                self.github_token, self.github_repository_name, version
+            )
+
+            if tag_sha != main_sha:
+                messages.critical(
+                    "Tag «{}» can not be created on Github, {}.".format(
+                        version,
+                        "it points at another commit"
+                        if tag_sha
+                        else "it can not be found either",
+                    )
+                )
+                return False
+
+            messages.warning(
+                "Tag «{}» already exists on Github.".format(version)
+            )
 
         else:
-            for error in response:
-                messages.critical(error)
+            messages.critical(
+                "Tag «{}» can not be created on Github ({}).".format(
+                    version, status_code
+                )
+            )
             return False
 
-    def finish_feature(self, issue_id):
-        issue_id = validators.validate_issue_id(issue_id)
-        feature_name = "{}-{}".format(self.jira_project_key, issue_id)
-        branch_name = "feature/{}".format(feature_name)
+        status_code = integrations.merge_branch(
+            self.github_token,
+            self.github_repository_name,
+            branch_name,
+            self.develop_branch,
+            "Merge branch '{}' into {}".format(
+                branch_name, self.develop_branch
+            ),
+        )
 
-        if not self._branch_exists(branch_name):
-            messages.error("«{}» doesn't exists locally.".format(branch_name))
-            return False
+        if status_code in (201, 204):
+            messages.info(
+                "«{}» merged into «{}» on Github.".format(
+                    branch_name, self.develop_branch
+                )
+            )
 
-        if not integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
-            messages.error("«{}» doesn't exists remotely.".format(branch_name))
+        else:
+            messages.critical(
+                "«{}» can not be merged into «{}» on Github ({}).".format(
+                    branch_name, self.develop_branch, status_code
+                )
+            )
             return False
 
-        self._change_branch(self.develop_branch)
-        self._pull_branch(self.develop_branch)
+        status_code = integrations.delete_branch(
+            self.github_token, self.github_repository_name, branch_name
+        )
 
-        self.repo.git.branch("-D", branch_name)
-        self.repo.git.push(self.remote_name, ":{}".format(branch_name))
-        self.repo.git.remote("prune", self.remote_name)
+        if status_code != 204:
+            messages.critical(
+                "«{}» can not be deleted on Github ({}).".format(
+                    branch_name, status_code
+                )
+            )
+            return False
 
+        messages.info("«{}» deleted on Github.".format(branch_name))
         messages.success(":fireworks:  «{}» finished.".format(branch_name))
-
-    def cancel_feature(self, issue_id):
-        messages.warning("Not implemented yet")
-
-    """ Release methods """
+        return True
 
     def start_release(self):
         release_name = self.version.bump_minor()
@@ -336,18 +1292,19 @@ class Glow(object):
             messages.error("«{}» already exists locally.".format(branch_name))
             return False
 
-        if integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
+        self._prefetch([branch_name, hotfix_branch_name, self.develop_branch])
+        remote_branch, remote_hotfix, develop_sha = self._remote_lookups(
+            branch_name, hotfix_branch_name, self.develop_branch
+        )
+
+        if remote_branch.result():
             messages.warning(
                 "«{}» already exists remotely.".format(branch_name)
             )
             self._pull_branch(branch_name, create=True)
             return False
 
-        if integrations.branch_exists(
-            self.github_token, self.github_repository_name, hotfix_branch_name
-        ):
+        if remote_hotfix.result():
             messages.critical(
                 "An hotfix «{}» is running...".format(hotfix_branch_name)
             )
@@ -358,17 +1315,8 @@ class Glow(object):
 
         self._pull_branch(self.develop_branch)
 
-        commit_sha = integrations.branch_exists(
-            self.github_token, self.github_repository_name, self.develop_branch
-        )
-        commit_ref = "refs/heads/{}".format(branch_name)
-
-        status_code = integrations.create_branch(
-            self.github_token,
-            self.github_repository_name,
-            commit_ref,
-            commit_sha,
-        )
+        commit_sha = develop_sha.result()
+        status_code = self._create_remote_branch(branch_name, commit_sha)
 
         if status_code == 201:
             messages.success("«{}» created on Github".format(branch_name))
@@ -399,19 +1347,25 @@ class Glow(object):
             messages.error("«{}» doesn't exists locally.".format(branch_name))
             return False
 
-        if not integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
+        self._prefetch([branch_name], [(branch_name, self.main_branch)])
+        if not self._remote_branch_exists(branch_name):
             messages.error("«{}» doesn't exists remotely.".format(branch_name))
             return False
 
-        self._change_branch(self.main_branch)
-        self._pull_branch(self.main_branch)
+        self._pull_branches(self.main_branch, self.develop_branch)
+        if not self._can_rebase_branch(branch_name, self.develop_branch):
+            return False
+
+        if not self._rebase_branch(branch_name, self.develop_branch):
+            return False
 
-        self._change_branch(branch_name)
-        self._rebase_branch(self.develop_branch)
         self._push_branch(branch_name, force=True)
 
+        url = self._open_pull_request(branch_name, self.main_branch)
+        if url:
+            messages.success("PR already open: {}".format(url))
+            return True
+
         changes = self._get_changes(branch_name, self.main_branch)
 
         status_code, response = integrations.create_pull_request(
@@ -433,6 +1387,12 @@ class Glow(object):
             return False
 
     def finish_release(self):
+        if self.remote:
+            return self._finish_remotely("release")
+
+        if self._is_interrupted():
+            return False
+
         release_name = self.version.bump_minor()
         branch_name = "release/{}".format(release_name)
 
@@ -440,27 +1400,14 @@ class Glow(object):
             messages.error("«{}» doesn't exists locally.".format(branch_name))
             return False
 
-        if not integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
+        self._prefetch([branch_name])
+        if not self._remote_branch_exists(branch_name):
             messages.error("«{}» doesn't exists remotely.".format(branch_name))
             return False
 
-        self._change_branch(self.main_branch)
-        self._pull_branch(self.main_branch)
-
-        self._create_tag(str(release_name))
-
-        self._change_branch(self.develop_branch)
-        self._pull_branch(self.develop_branch)
-
-        self.repo.git.merge("--no-ff", branch_name)
-        self.repo.git.branch("-D", branch_name)
-        self.repo.git.push(self.remote_name, ":{}".format(branch_name))
-        self.repo.git.push(self.remote_name, self.develop_branch)
-        self.repo.git.remote("prune", self.remote_name)
-
-        self._push_tags()
+        self._run_steps(
+            "finish_release", branch_name=branch_name, version=str(release_name)
+        )
 
         messages.success(":fireworks:  «{}» finished.".format(branch_name))
 
@@ -477,9 +1424,12 @@ class Glow(object):
             messages.error("«{}» already exists locally.".format(branch_name))
             return False
 
-        if integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
+        self._prefetch([branch_name, self.main_branch])
+        remote_branch, main_sha = self._remote_lookups(
+            branch_name, self.main_branch
+        )
+
+        if remote_branch.result():
             messages.warning(
                 "«{}» already exists remotely.".format(branch_name)
             )
@@ -491,17 +1441,8 @@ class Glow(object):
 
         self._pull_branch(self.main_branch)
 
-        commit_sha = integrations.branch_exists(
-            self.github_token, self.github_repository_name, self.main_branch
-        )
-        commit_ref = "refs/heads/{}".format(branch_name)
-
-        status_code = integrations.create_branch(
-            self.github_token,
-            self.github_repository_name,
-            commit_ref,
-            commit_sha,
-        )
+        commit_sha = main_sha.result()
+        status_code = self._create_remote_branch(branch_name, commit_sha)
 
         if status_code == 201:
             messages.success("«{}» created on Github".format(branch_name))
@@ -532,19 +1473,25 @@ class Glow(object):
             messages.error("«{}» doesn't exists locally.".format(branch_name))
             return False
 
-        if not integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
+        self._prefetch([branch_name], [(branch_name, self.main_branch)])
+        if not self._remote_branch_exists(branch_name):
             messages.error("«{}» doesn't exists remotely.".format(branch_name))
             return False
 
-        self._change_branch(self.main_branch)
         self._pull_branch(self.main_branch)
+        if not self._can_rebase_branch(branch_name, self.main_branch):
+            return False
+
+        if not self._rebase_branch(branch_name, self.main_branch):
+            return False
 
-        self._change_branch(branch_name)
-        self._rebase_branch(self.main_branch)
         self._push_branch(branch_name, force=True)
 
+        url = self._open_pull_request(branch_name, self.main_branch)
+        if url:
+            messages.success("PR already open: {}".format(url))
+            return True
+
         changes = self._get_changes(branch_name, self.main_branch)
 
         status_code, response = integrations.create_pull_request(
@@ -566,6 +1513,12 @@ class Glow(object):
             return False
 
     def finish_hotfix(self):
+        if self.remote:
+            return self._finish_remotely("hotfix")
+
+        if self._is_interrupted():
+            return False
+
         hotfix_name = self.version.bump_patch()
         branch_name = "hotfix/{}".format(hotfix_name)
 
@@ -573,45 +1526,287 @@ class Glow(object):
             messages.error("«{}» doesn't exists locally.".format(branch_name))
             return False
 
-        if not integrations.branch_exists(
-            self.github_token, self.github_repository_name, branch_name
-        ):
+        self._prefetch([branch_name])
+        if not self._remote_branch_exists(branch_name):
             messages.error("«{}» doesn't exists remotely.".format(branch_name))
             return False
 
-        self._change_branch(self.main_branch)
-        self._pull_branch(self.main_branch)
+        self._run_steps(
+            "finish_hotfix", branch_name=branch_name, version=str(hotfix_name)
+        )
 
-        self._create_tag(str(hotfix_name))
+        messages.success(":fireworks:  «{}» finished.".format(branch_name))
 
-        self._change_branch(self.develop_branch)
-        self._pull_branch(self.develop_branch)
+    def cancel_hotfix(self):
+        messages.warning("Not implemented yet")
 
-        self.repo.git.merge("--no-ff", branch_name)
-        self.repo.git.branch("-D", branch_name)
-        self.repo.git.push(self.remote_name, ":{}".format(branch_name))
-        self.repo.git.push(self.remote_name, self.develop_branch)
-        self.repo.git.remote("prune", self.remote_name)
+    """ Status methods """
+
+    def _branch_statuses(self):
+        """(name, base, ahead, behind, remote) of every glow branch
+
+        Local and remote-tracking branches come from a single for-each-ref
+        pass, which also computes ahead/behind counts on git 2.41+. Older
+        gits count them from a single history walk, see _ahead_behind().
+        Remote-tracking branches shadowed by a local one aren't counted.
+        """
+        bases = {
+            "feature": self.develop_branch,
+            "release": self.develop_branch,
+            "hotfix": self.main_branch,
+        }
+        remote_prefix = "refs/remotes/{}/".format(self.remote_name)
+        has_ahead_behind = self.repo.git.version_info >= (2, 41)
+
+        # Words before the trailing upstream:track, e.g. "[ahead 1, behind 2]"
+        fields = ["%(refname)", "%(objectname)", "%(upstream:short)"]
+        if has_ahead_behind:
+            fields += [
+                "%(ahead-behind:{})".format(self.develop_branch),
+                "%(ahead-behind:{})".format(self.main_branch),
+            ]
+        words = len(fields) + (2 if has_ahead_behind else 0)
+        fields.append("%(upstream:track)")
+
+        base_refs = [
+            "refs/heads/{}".format(base) for base in set(bases.values())
+        ]
+        patterns = base_refs + [
+            prefix + kind
+            for prefix in ("refs/heads/", remote_prefix)
+            for kind in bases
+        ]
+        output = self.repo.git.for_each_ref(
+            "--format={}".format(" ".join(fields)), *patterns
+        )
 
-        self._push_tags()
+        base_shas, local_branches, remote_branches = {}, {}, {}
+        for line in output.splitlines():
+            ref, sha, upstream, *counts = line.split(" ", words)
+            track = counts.pop()
 
-        messages.success(":fireworks:  «{}» finished.".format(branch_name))
+            if ref in base_refs:
+                base_shas[ref.replace("refs/heads/", "", 1)] = sha
+                continue
 
-    def cancel_hotfix(self):
-        messages.warning("Not implemented yet")
+            if ref.startswith(remote_prefix):
+                name = ref.replace(remote_prefix, "", 1)
+                branches = remote_branches
+            else:
+                name = ref.replace("refs/heads/", "", 1)
+                branches = local_branches
+
+            base = bases[name.split("/", 1)[0]]
+            if has_ahead_behind:
+                index = 0 if base == self.develop_branch else 2
+                counts = int(counts[index]), int(counts[index + 1])
+
+            branches[name] = (base, sha, counts, upstream, track)
+
+        if not has_ahead_behind:
+            shown = list(local_branches.values()) + [
+                branch
+                for name, branch in remote_branches.items()
+                if name not in local_branches
+            ]
+            walked_counts = self._ahead_behind(
+                [(sha, base_shas[base]) for base, sha, *_ in shown]
+            )
+
+        statuses = []
+        for name in sorted(set(local_branches) | set(remote_branches)):
+            if name not in local_branches:
+                base, sha, counts, _, _ = remote_branches[name]
+                remote = "remote only"
+
+            else:
+                base, sha, counts, upstream, track = local_branches[name]
+
+                if track == "[gone]":
+                    remote = "gone"
+                elif upstream or name in remote_branches:
+                    remote = "{} {}".format(self.remote_name, track).strip()
+                else:
+                    remote = "local only"
+
+            if not has_ahead_behind:
+                counts = walked_counts[sha, base_shas[base]]
+
+            statuses.append((name, base, *counts, remote))
+
+        return statuses
+
+    def _ahead_behind(self, pairs):
+        """Map (sha, base sha) pairs to ahead/behind counts, in one walk
+
+        Commits below the merge base of every tip are reachable from all of
+        them and count on neither side, so the walk stops there.
+        """
+        if not pairs:
+            return {}
+
+        tips = sorted(set(sha for pair in pairs for sha in pair))
+        merge_bases = self.repo.git.merge_base(
+            "--octopus", *tips, with_exceptions=False
+        ).split()
+
+        parents = {}
+        for line in self.repo.git.rev_list(
+            "--parents", *tips, "--not", *merge_bases
+        ).splitlines():
+            sha, *parent_shas = line.split()
+            parents[sha] = parent_shas
+
+        reachable = {}
+
+        def reachable_from(tip):
+            if tip not in reachable:
+                commits, pending = set(), [tip]
+                while pending:
+                    sha = pending.pop()
+                    if sha in parents and sha not in commits:
+                        commits.add(sha)
+                        pending.extend(parents[sha])
+                reachable[tip] = commits
+            return reachable[tip]
+
+        return {
+            (sha, base_sha): (
+                len(reachable_from(sha) - reachable_from(base_sha)),
+                len(reachable_from(base_sha) - reachable_from(sha)),
+            )
+            for sha, base_sha in pairs
+        }
+
+    def status(self):
+        head = self.repo.head
+        current_branch = None if head.is_detached else head.ref.name
+
+        messages.info(
+            "Next release: {}, next hotfix: {}".format(
+                self.version.bump_minor(), self.version.bump_patch()
+            )
+        )
+
+        statuses = self._branch_statuses()
+        if not statuses:
+            messages.log("No feature, release or hotfix in flight.")
+            return True
+
+        width = max(len(name) for name, *_ in statuses)
+        for name, base, ahead, behind, remote in statuses:
+            messages.log(
+                "{} {}  ↑{:<5} ↓{:<5} {:<8} {}".format(
+                    "*" if name == current_branch else " ",
+                    name.ljust(width),
+                    ahead,
+                    behind,
+                    base,
+                    remote,
+                )
+            )
+
+        return True
+
+    """ Release notes methods """
+
+    def notes(self, *versions):
+        tags = self._tags()
+
+        if not tags:
+            messages.warning("No version found for this repository...")
+            return False
+
+        for version in versions:
+            if version not in tags:
+                messages.error("Unknown version «{}»".format(version))
+                return False
+
+        release_notes = ReleaseNotes(
+            self.repo, self.jira_project_key, self.glow_directory
+        )
+
+        if not versions:
+            changes = release_notes.since(tags[-1], self.develop_branch)
+            messages.info("Unreleased")
+            messages.log(changes or "No changes")
+
+        for version, changes in release_notes.release_notes(
+            tags, versions or tags[-1:]
+        ):
+            messages.info(version)
+            messages.log(changes or "No changes")
+
+        return True
+
+    """ Daemon methods """
+
+    def daemon(self, action="start"):
+        from . import daemon
+
+        if action == "stop":
+            return daemon.stop(self.repo.git_dir)
+
+        # Warm repository, configuration and version before serving
+        _ = self.config, self.version
+        return daemon.serve(self)
 
     """Main"""
 
     def main(self):
         args = helpers.parse_args()
 
-        method_name = "{}_{}".format(args.action, args.entity)
-        methods_names = helpers.get_method_names(self)
+        methods_names = [
+            name
+            for name in helpers.get_method_names(self.__class__)
+            if name != "main"
+        ]
+        method_name, keys = helpers.get_command(args, methods_names)
 
         validators.validate_method_name(method_name, methods_names)
 
+        helpers.assume_yes = args.yes
+        self.dry_run = args.dry_run
+        self.older_than = args.older_than
+        self.remote = args.remote
+
+        if self.remote and method_name not in REMOTE_COMMANDS:
+            messages.critical(
+                "--remote only applies to finish release and finish hotfix"
+            )
+            sys.exit(1)
+
+        if args.timings or args.trace:
+            from . import tracing
+
+            tracing.enable()
+
+        # Set on every command, a daemon runs several in the same process
+        integrations.disable_cache()
+        if self.remote:
+            self._config = None
+
+        else:
+            integrations.share_rate_limit(self.glow_directory)
+            if not args.no_cache:
+                integrations.enable_cache(self.glow_directory)
+
         _func = getattr(self, method_name)
-        _func(*args.key)
+
+        try:
+            if _func(*keys) is False:
+                sys.exit(1)
+
+        finally:
+            if self.remote:
+                # Read from this command's environment, never reused
+                self._config = None
+
+            if args.timings:
+                tracing.report()
+
+            if args.trace:
+                tracing.write_trace(args.trace)
 
 
 if __name__ == "__main__":
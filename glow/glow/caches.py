@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+RESPONSE_CACHE_FILENAME = "http-cache.json"
+RESPONSE_CACHE_MAX_BYTES = 1024 * 1024
+
+
+def write_json(path, data):
+    """Atomically replace path with data, creating its directory if needed"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    temporary_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temporary_path, "w") as temporary_file:
+        json.dump(data, temporary_file)
+
+    os.replace(temporary_path, path)
+
+
+def read_json(path, default=None):
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+
+    except (OSError, ValueError):
+        return default
+
+
+class CachedResponse(object):
+    """Stored Github response, replayed on a 304 Not Modified"""
+
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ResponseCache(object):
+    """On-disk ETag / Last-Modified cache of GET responses with LRU eviction
+
+    Entries are keyed by a hash of the token and the URL, so neither the
+    token nor responses fetched with another token can leak across keys.
+    """
+
+    def __init__(self, path, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self._entries = None
+
+    @staticmethod
+    def key(token, url):
+        return hashlib.sha256("{}\n{}".format(token, url).encode()).hexdigest()
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = OrderedDict(read_json(self.path, default=[]))
+        return self._entries
+
+    def validators(self, key):
+        """Conditional request headers for a cached entry"""
+        with self.lock:
+            entry = self.entries.get(key)
+
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def replay(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            self.entries.move_to_end(key)
+            self._save()
+
+        return CachedResponse(entry["status_code"], {}, entry["text"])
+
+    def store(self, key, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        with self.lock:
+            self.entries[key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "status_code": response.status_code,
+                "text": response.text,
+            }
+            self.entries.move_to_end(key)
+            self._evict()
+            self._save()
+
+    def _evict(self):
+        size = sum(len(entry["text"]) for entry in self.entries.values())
+
+        while size > self.max_bytes and self.entries:
+            _, entry = self.entries.popitem(last=False)
+            size -= len(entry["text"])
+
+    def _save(self):
+        write_json(self.path, list(self.entries.items()))
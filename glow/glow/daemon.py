@@ -0,0 +1,279 @@
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+
+from . import integrations, messages
+
+
+SOCKET_FILENAME = "daemon.sock"
+
+
+def find_git_directory(path):
+    """Git directory of the repository containing path, without git"""
+    while True:
+        dot_git = os.path.join(path, ".git")
+
+        if os.path.isdir(dot_git):
+            return dot_git
+
+        if os.path.isfile(dot_git):
+            with open(dot_git) as dot_git_file:
+                content = dot_git_file.read().strip()
+
+            if content.startswith("gitdir:"):
+                git_directory = content.split(":", 1)[1].strip()
+                return os.path.normpath(os.path.join(path, git_directory))
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+
+        path = parent
+
+
+def socket_path(git_directory):
+    return os.path.join(git_directory, "glow", SOCKET_FILENAME)
+
+
+def refs_fingerprint(git_directory):
+    """Modification times of everything glow state is derived from
+
+    Refs are updated by renaming a lock file, which touches their
+    directory, so directory times are enough for loose refs.
+    """
+    fingerprint = []
+
+    for name in ("HEAD", "config", "packed-refs"):
+        try:
+            fingerprint.append(
+                os.stat(os.path.join(git_directory, name)).st_mtime_ns
+            )
+
+        except OSError:
+            fingerprint.append(None)
+
+    for root, _, _ in os.walk(os.path.join(git_directory, "refs")):
+        fingerprint.append((root, os.stat(root).st_mtime_ns))
+
+    return fingerprint
+
+
+class _SocketWriter(object):
+    """Text stream sending everything written to the client"""
+
+    def __init__(self, connection, tty):
+        self.connection = connection
+        self.tty = tty
+
+    def write(self, text):
+        _send(self.connection, {"out": text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return self.tty
+
+
+def _send(connection, frame):
+    connection.sendall((json.dumps(frame) + "\n").encode())
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+
+        if request.get("stop"):
+            self.server.stopped = True
+            exit_code = 0
+
+        else:
+            exit_code = self.server.run(request, self.rfile, self.connection)
+
+        _send(self.connection, {"exit": exit_code})
+
+
+class Daemon(socketserver.UnixStreamServer):
+    """Serve glow commands of one repository from a warm Glow instance"""
+
+    def __init__(self, glow, path):
+        self.glow = glow
+        self.stopped = False
+        self.fingerprint = refs_fingerprint(glow.repo.git_dir)
+        socketserver.UnixStreamServer.__init__(self, path, _DaemonHandler)
+
+    def run(self, request, rfile, connection):
+        from . import tracing
+
+        # Compared with the state before the previous command, so refs
+        # changed by that command reset the Glow instance too
+        fingerprint = refs_fingerprint(self.glow.repo.git_dir)
+        if fingerprint != self.fingerprint:
+            self.glow._reset()
+        self.fingerprint = fingerprint
+
+        self.glow._remote_refs = self.glow._remote_states = None
+        self.glow._local_branches = None
+        tracing.reset()
+
+        saved_environ, saved_cwd = dict(os.environ), os.getcwd()
+        for name in [name for name in os.environ if name.startswith("GLOW_")]:
+            del os.environ[name]
+        os.environ.update(request["env"])
+        os.chdir(request["cwd"])
+        integrations.configure()
+
+        saved_streams = sys.argv, sys.stdin, sys.stdout, sys.stderr
+        stdin = io.TextIOWrapper(rfile, encoding="utf-8")
+        sys.argv = ["git-glow"] + request["argv"]
+        sys.stdin = stdin
+        sys.stdout = sys.stderr = _SocketWriter(connection, request["tty"])
+
+        try:
+            self.glow.main()
+            exit_code = 0
+
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                exit_code = exc.code or 0
+
+            else:
+                print(exc.code)
+                exit_code = 1
+
+        except Exception:
+            traceback.print_exc(file=sys.stdout)
+            exit_code = 1
+
+        finally:
+            stdin.detach()
+            sys.argv, sys.stdin, sys.stdout, sys.stderr = saved_streams
+            os.environ.clear()
+            os.environ.update(saved_environ)
+            os.chdir(saved_cwd)
+            integrations.configure()
+
+        return exit_code
+
+
+def _connect(path):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        connection.connect(path)
+
+    except OSError:
+        connection.close()
+        return None
+
+    return connection
+
+
+def serve(glow):
+    path = socket_path(glow.repo.git_dir)
+
+    if os.path.exists(path):
+        connection = _connect(path)
+        if connection is not None:
+            connection.close()
+            messages.error("A glow daemon is already running.")
+            return False
+
+        os.remove(path)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    server = Daemon(glow, path)
+    messages.success("Glow daemon listening on {}".format(path))
+
+    try:
+        while not server.stopped:
+            server.handle_request()
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        server.server_close()
+        os.remove(path)
+
+    messages.info("Glow daemon stopped.")
+    return True
+
+
+def stop(git_directory):
+    connection = _connect(socket_path(git_directory))
+
+    if connection is None:
+        messages.warning("No glow daemon is running.")
+        return False
+
+    with connection:
+        _send(connection, {"stop": True})
+        connection.makefile("rb").readline()
+
+    messages.success("Glow daemon stopped.")
+    return True
+
+
+def _forward_stdin(connection):
+    for line in sys.stdin:
+        connection.sendall(line.encode())
+
+    # Let the daemon see the end of stdin, e.g. stdin is /dev/null
+    try:
+        connection.shutdown(socket.SHUT_WR)
+
+    except OSError:
+        pass
+
+
+def forward(argv):
+    """Run a command on the repository daemon and return its exit code
+
+    Returns None when no daemon serves the current repository.
+    """
+    git_directory = find_git_directory(os.getcwd())
+    if git_directory is None:
+        return None
+
+    connection = _connect(socket_path(git_directory))
+    if connection is None:
+        return None
+
+    with connection:
+        _send(
+            connection,
+            {
+                "argv": argv,
+                "tty": sys.stdout.isatty(),
+                "cwd": os.getcwd(),
+                "env": {
+                    name: value
+                    for name, value in os.environ.items()
+                    if name.startswith("GLOW_")
+                },
+            },
+        )
+
+        stdin_thread = threading.Thread(
+            target=_forward_stdin, args=(connection,), daemon=True
+        )
+        stdin_thread.start()
+
+        for line in connection.makefile("rb"):
+            frame = json.loads(line)
+
+            if "exit" in frame:
+                return frame["exit"]
+
+            sys.stdout.write(frame["out"])
+            sys.stdout.flush()
+
+    messages.critical("Connection to the glow daemon was lost.")
+    return 1
@@ -1,17 +1,85 @@
 import argparse
+import os
+import re
 import sys
+from collections import OrderedDict
 
 from . import messages
 
 
+PULL_REQUEST_BODY_MAX_LENGTH = 60000
+CHANGELOG_TAIL = "\n\n_… and {} more commits_"
+
+assume_yes = False
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Glow your workflow")
     parser.add_argument("action")
-    parser.add_argument("entity")
+    parser.add_argument("entity", nargs="?", default=None)
     parser.add_argument("key", nargs="*", default=None)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="don't use the Github response cache stored in .git/glow/",
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        default=env_flag("GLOW_ASSUME_YES"),
+        help="answer yes to every confirmation",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="list what prune would delete, without deleting anything",
+    )
+    parser.add_argument(
+        "--older-than",
+        metavar="DAYS",
+        type=int,
+        default=None,
+        help="only prune branches without commit for DAYS days",
+    )
+    parser.add_argument(
+        "--remote",
+        action="store_true",
+        help="finish a release or hotfix through the Github API, no clone",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        default=env_flag("GLOW_TIMINGS"),
+        help="print the duration of every git command and Github request",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        default=os.environ.get("GLOW_TRACE"),
+        help="write git commands and Github requests to a JSON trace file",
+    )
     return parser.parse_args()
 
 
+def env_flag(name):
+    return os.environ.get(name, "").lower() not in ("", "0", "false", "no")
+
+
+def get_command(args, methods_names):
+    """Resolve «action entity key…» and single word «action key…» commands"""
+    method_name = "{}_{}".format(args.action, args.entity)
+    keys = list(args.key)
+
+    if args.entity is None or (
+        method_name not in methods_names and args.action in methods_names
+    ):
+        method_name = args.action
+        if args.entity is not None:
+            keys.insert(0, args.entity)
+
+    return method_name, keys
+
+
 def get_method_names(klass):
     return [
         func
@@ -27,9 +95,128 @@ def ask(
     ],
     exit_tty=True,
 ):
-    answer = messages.question(question)
+    if assume_yes:
+        messages.log("{}{}".format(question, options[0]))
+        return
+
+    try:
+        answer = messages.question(question)
+
+    except EOFError:
+        answer = ""
+
     if answer.lower() not in options:
         messages.warning("Quitting...")
 
         if exit_tty:
             sys.exit(1)
+
+
+def build_changelog(
+    subjects, jira_project_key, max_length=PULL_REQUEST_BODY_MAX_LENGTH
+):
+    """Group commit subjects by Jira issue, in at most max_length chars
+
+    Subjects are consumed lazily and deduplicated; the ones which don't
+    fit in the budget any more are only counted.
+    """
+    issue_pattern = re.compile(
+        r"\b{}-\d+\b".format(re.escape(jira_project_key)), re.IGNORECASE
+    )
+
+    # Rendered length, newlines included, leaving room for the tail
+    budget = max_length - len(CHANGELOG_TAIL.format(sys.maxsize))
+    groups = OrderedDict()
+    length = 0
+    more = 0
+
+    for subject in subjects:
+        subject = subject.strip()
+        if not subject:
+            continue
+
+        match = issue_pattern.search(subject)
+        issue_key = match.group(0).upper() if match else None
+
+        group = groups.get(issue_key)
+        if group is not None and subject in group:
+            continue
+
+        # "- subject\n", preceded by "\n**issue**\n" for a new group
+        cost = len(subject) + 3
+        if group is None:
+            cost += len(issue_key or "Other changes") + 6
+
+        if length + cost > budget:
+            more += 1
+            continue
+
+        if group is None:
+            group = groups[issue_key] = OrderedDict()
+
+        group[subject] = None
+        length += cost
+
+    other_changes = groups.pop(None, None)
+    if other_changes is not None:
+        groups[None] = other_changes
+
+    lines = []
+    for issue_key, group in groups.items():
+        if lines:
+            lines.append("")
+
+        lines.append("**{}**".format(issue_key or "Other changes"))
+        lines.extend("- {}".format(subject) for subject in group)
+
+    changelog = "\n".join(lines)
+    if more:
+        changelog += CHANGELOG_TAIL.format(more)
+
+    return changelog
+
+
+def log_subjects(git, revision_range):
+    """Lazily yield commit subjects of revision_range from a git process"""
+    process = git.log(revision_range, "--pretty=format:%s", as_process=True)
+
+    try:
+        for line in process.stdout:
+            yield line.decode("utf-8", "replace")
+
+    finally:
+        process.wait()
+
+
+def read_local_branches(git_directory):
+    """Names of local branches, read from packed-refs and loose refs
+
+    Parses ref files directly rather than spawning git or listing them
+    through GitPython, which re-reads every ref for each lookup.
+    """
+    branch_names = set()
+
+    try:
+        with open(os.path.join(git_directory, "packed-refs")) as packed_refs:
+            for line in packed_refs:
+                _, _, ref = line.rstrip("\n").partition(" ")
+
+                if not line.startswith(("#", "^")) and ref.startswith(
+                    "refs/heads/"
+                ):
+                    branch_names.add(ref.replace("refs/heads/", "", 1))
+
+    except OSError:
+        pass
+
+    heads_directory = os.path.join(git_directory, "refs", "heads")
+    for root, _, file_names in os.walk(heads_directory):
+        for file_name in file_names:
+            if file_name.endswith(".lock"):
+                continue
+
+            path = os.path.join(root, file_name)
+            branch_name = os.path.relpath(path, heads_directory)
+            branch_names.add(branch_name.replace(os.sep, "/"))
+
+    return branch_names
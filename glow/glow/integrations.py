@@ -1,28 +1,205 @@
 import json
+import os
+import threading
+import time
 
-from requests import Session
+from . import caches, messages, ratelimits
 
-from . import messages
 
+GITHUB_API_URL = None
+GITHUB_GRAPHQL_URL = None
 
-GITHUB_API_URL = "https://api.github.com"
+HTTP_TIMEOUT = 10
+HTTP_POOL_SIZE = 4
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUS_FORCELIST = (500, 502, 503, 504)
+HTTP_RATE_LIMIT_RETRIES = 2
 
+_clients = {}
+_clients_lock = threading.Lock()
+_executor = None
+_response_cache = None
+_rate_limiter = ratelimits.RateLimiter()
 
-def branch_exists(github_token, repository_name, branch_name):
-    session = Session()
 
-    headers = {
-        "Authorization": "token {}".format(github_token),
-        "Content-Type": "application/json",
-    }
+def configure():
+    """Read Github endpoints from the environment"""
+    global GITHUB_API_URL, GITHUB_GRAPHQL_URL
 
-    response = session.get(
-        "{}/repos/{}/branches/{}".format(
-            GITHUB_API_URL,
-            repository_name,
-            branch_name,
-        ),
-        headers=headers,
+    GITHUB_API_URL = os.environ.get(
+        "GLOW_GITHUB_API_URL", "https://api.github.com"
+    )
+    GITHUB_GRAPHQL_URL = os.environ.get(
+        "GLOW_GITHUB_GRAPHQL_URL", "{}/graphql".format(GITHUB_API_URL)
+    )
+
+
+configure()
+
+
+class GithubClient(object):
+    """Keep-alive HTTP client shared by every Github call of the process"""
+
+    def __init__(self, github_token):
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.github_token = github_token
+        self.session = Session()
+        self.session.headers.update(
+            {
+                "Authorization": "token {}".format(github_token),
+                "Content-Type": "application/json",
+            }
+        )
+
+        retry = Retry(
+            total=HTTP_RETRY_TOTAL,
+            backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+            status_forcelist=HTTP_RETRY_STATUS_FORCELIST,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, path, **kwargs):
+        from . import tracing
+
+        kwargs.setdefault("timeout", HTTP_TIMEOUT)
+
+        for attempt in range(HTTP_RATE_LIMIT_RETRIES + 1):
+            delay = _rate_limiter.wait()
+            if delay:
+                return caches.CachedResponse(
+                    429,
+                    {"Retry-After": "{:.0f}".format(delay)},
+                    json.dumps(
+                        {
+                            "message": "Github rate limit reached, "
+                            "retry in {:.0f}s".format(delay)
+                        }
+                    ),
+                )
+
+            started = time.perf_counter()
+            response = None
+
+            url = path
+            if not path.startswith(("http://", "https://")):
+                url = "{}{}".format(GITHUB_API_URL, path)
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+
+            finally:
+                tracing.record(
+                    "http",
+                    "{} {}".format(method, path),
+                    started,
+                    len(response.content) if response is not None else 0,
+                    response.status_code if response is not None else "error",
+                )
+
+            if not _rate_limiter.update(response):
+                break
+
+        return response
+
+    def get(self, path, **kwargs):
+        cache = _response_cache
+        if cache is None:
+            return self.request("GET", path, **kwargs)
+
+        key = cache.key(self.github_token, "{}{}".format(GITHUB_API_URL, path))
+        headers = kwargs.pop("headers", {})
+        headers.update(cache.validators(key))
+
+        response = self.request("GET", path, headers=headers, **kwargs)
+
+        if response.status_code == 304:
+            cached_response = cache.replay(key)
+            if cached_response is not None:
+                return cached_response
+
+        cache.store(key, response)
+        return response
+
+    def post(self, path, payload, **kwargs):
+        return self.request("POST", path, data=json.dumps(payload), **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def enable_cache(directory):
+    """Serve GET requests through an ETag cache stored in directory"""
+    global _response_cache
+
+    _response_cache = caches.ResponseCache(
+        os.path.join(directory, caches.RESPONSE_CACHE_FILENAME)
+    )
+
+
+def disable_cache():
+    global _response_cache
+
+    _response_cache = None
+
+
+def share_rate_limit(directory):
+    """Share the Github rate limit budget through a file in directory"""
+    _rate_limiter.path = os.path.join(
+        directory, ratelimits.RATE_LIMIT_FILENAME
+    )
+
+
+def get_client(github_token):
+    # Concurrent lookups must share one client, not race to create theirs
+    with _clients_lock:
+        client = _clients.get(github_token)
+
+        if client is None:
+            client = GithubClient(github_token)
+            _clients[github_token] = client
+
+    return client
+
+
+def close_clients():
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+
+        _clients.clear()
+
+
+def submit(func, *args):
+    """Run a call on the shared thread pool and return its future"""
+    global _executor
+
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _executor = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE)
+
+    return _executor.submit(func, *args)
+
+
+def branch_exists(github_token, repository_name, branch_name):
+    client = get_client(github_token)
+
+    response = client.get(
+        "/repos/{}/branches/{}".format(repository_name, branch_name)
     )
 
     if response.status_code != 200:
@@ -42,22 +219,116 @@ def branch_exists(github_token, repository_name, branch_name):
 
 
 def create_branch(github_token, repository_name, commit_ref, commit_sha):
-    session = Session()
-    headers = {
-        "Authorization": "token {}".format(github_token),
-        "Content-Type": "application/json",
-    }
+    client = get_client(github_token)
+
     payload = {
         "ref": commit_ref,
         "sha": commit_sha,
     }
-    response = session.post(
-        "{}/repos/{}/git/refs".format(
-            GITHUB_API_URL,
-            repository_name,
-        ),
-        headers=headers,
-        data=json.dumps(payload),
+    response = client.post(
+        "/repos/{}/git/refs".format(repository_name), payload
+    )
+    return response.status_code
+
+
+def branch_names(github_token, repository_name, prefix):
+    """Names of the branches starting with prefix, None on failure"""
+    client = get_client(github_token)
+
+    response = client.get(
+        "/repos/{}/git/matching-refs/heads/{}".format(repository_name, prefix)
+    )
+
+    if response.status_code != 200:
+        messages.critical(
+            "Branches of {} can not be listed ({}).".format(
+                repository_name, response.status_code
+            )
+        )
+        return None
+
+    return [
+        ref["ref"].replace("refs/heads/", "", 1) for ref in response.json()
+    ]
+
+
+def create_tag(github_token, repository_name, tag_name, commit_sha, message):
+    """Tag commit_sha, with an annotated tag when message is set"""
+    client = get_client(github_token)
+
+    if message:
+        response = client.post(
+            "/repos/{}/git/tags".format(repository_name),
+            {
+                "tag": tag_name,
+                "message": message,
+                "object": commit_sha,
+                "type": "commit",
+            },
+        )
+        if response.status_code != 201:
+            return response.status_code
+
+        commit_sha = response.json()["sha"]
+
+    return create_branch(
+        github_token,
+        repository_name,
+        "refs/tags/{}".format(tag_name),
+        commit_sha,
+    )
+
+
+def tag_commit(github_token, repository_name, tag_name):
+    """Commit SHA tag_name points at, peeling annotated tags
+
+    Returns False when the tag doesn't exist, None on failure.
+    """
+    client = get_client(github_token)
+
+    response = client.get(
+        "/repos/{}/git/ref/tags/{}".format(repository_name, tag_name)
+    )
+
+    if response.status_code == 404:
+        return False
+
+    if response.status_code != 200:
+        return None
+
+    target = response.json()["object"]
+    if target["type"] == "tag":
+        response = client.get(
+            "/repos/{}/git/tags/{}".format(repository_name, target["sha"])
+        )
+        if response.status_code != 200:
+            return None
+
+        target = response.json()["object"]
+
+    return target["sha"]
+
+
+def merge_branch(github_token, repository_name, head, base, commit_message):
+    """Merge head into base on Github, 201 merged and 204 already merged"""
+    client = get_client(github_token)
+
+    payload = {
+        "base": base,
+        "head": head,
+        "commit_message": commit_message,
+    }
+    response = client.post(
+        "/repos/{}/merges".format(repository_name), payload
+    )
+    return response.status_code
+
+
+def delete_branch(github_token, repository_name, branch_name):
+    client = get_client(github_token)
+
+    response = client.delete(
+        "/repos/{}/git/refs/heads/{}".format(repository_name, branch_name)
     )
     return response.status_code
 
@@ -65,12 +336,8 @@ def create_branch(github_token, repository_name, commit_ref, commit_sha):
 def create_pull_request(
     github_token, repository_name, source_branch, dest_branch, title, body
 ):
-    session = Session()
+    client = get_client(github_token)
 
-    headers = {
-        "Authorization": "token {}".format(github_token),
-        "Content-Type": "application/json",
-    }
     payload = {
         "title": title,
         "body": body,
@@ -78,16 +345,85 @@ def create_pull_request(
         "base": dest_branch,
     }
 
-    response = session.post(
-        "{}/repos/{}/pulls".format(GITHUB_API_URL, repository_name),
-        headers=headers,
-        data=json.dumps(payload),
-    )
+    response = client.post("/repos/{}/pulls".format(repository_name), payload)
 
     if response.status_code == 201:
         return response.status_code, response.json().get("html_url")
 
     else:
+        content = response.json()
+        fallback = "Github answered {}".format(response.status_code)
         return response.status_code, [
-            _.get("message") for _ in response.json().get("errors")
+            _.get("message") or fallback
+            for _ in content.get("errors") or [content]
         ]
+
+
+def repository_state(
+    github_token, repository_name, branch_names, pull_requests=()
+):
+    """Fetch branch heads and open pull requests in one GraphQL query
+
+    pull_requests are (source branch, destination branch) pairs. Returns
+    a dict mapping every branch name to its head SHA (False when missing)
+    and every pair to the URL of its open pull request (False when none),
+    or None when the query failed.
+    """
+    client = get_client(github_token)
+    owner, name = repository_name.split("/", 1)
+
+    variables = {"owner": owner, "name": name}
+    declarations = ["$owner: String!", "$name: String!"]
+    fields = []
+
+    for index, branch_name in enumerate(branch_names):
+        variables["branch{}".format(index)] = "refs/heads/{}".format(
+            branch_name
+        )
+        declarations.append("$branch{}: String!".format(index))
+        fields.append(
+            "branch{0}: ref(qualifiedName: $branch{0}) "
+            "{{ target {{ oid }} }}".format(index)
+        )
+
+    for index, (source_branch, dest_branch) in enumerate(pull_requests):
+        variables["head{}".format(index)] = source_branch
+        variables["base{}".format(index)] = dest_branch
+        declarations.append("$head{}: String!".format(index))
+        declarations.append("$base{}: String!".format(index))
+        fields.append(
+            "pull{0}: pullRequests(headRefName: $head{0}, "
+            "baseRefName: $base{0}, states: OPEN, first: 1) "
+            "{{ nodes {{ url }} }}".format(index)
+        )
+
+    query = "query({}) {{ repository(owner: $owner, name: $name) {{ {} }} }}"
+    response = client.post(
+        GITHUB_GRAPHQL_URL,
+        {
+            "query": query.format(", ".join(declarations), " ".join(fields)),
+            "variables": variables,
+        },
+    )
+
+    try:
+        content = response.json()
+        repository = content["data"]["repository"]
+
+    except (ValueError, KeyError, TypeError):
+        repository = None
+
+    if response.status_code != 200 or not repository:
+        messages.warning("Github GraphQL query failed, using REST API")
+        return None
+
+    state = {}
+    for index, branch_name in enumerate(branch_names):
+        ref = repository["branch{}".format(index)]
+        state[branch_name] = ref["target"]["oid"] if ref else False
+
+    for index, pull_request in enumerate(pull_requests):
+        nodes = repository["pull{}".format(index)]["nodes"]
+        state[tuple(pull_request)] = nodes[0]["url"] if nodes else False
+
+    return state
@@ -0,0 +1,39 @@
+import os
+
+from . import caches
+
+
+JOURNAL_FILENAME = "journal.json"
+
+
+class Journal(object):
+    """Completed steps of the running command, kept until it is done
+
+    Each step is recorded as soon as it succeeds, so a command interrupted
+    halfway, e.g. by a network failure during a push, can be resumed from
+    its first incomplete step.
+    """
+
+    def __init__(self, glow_directory):
+        self.path = os.path.join(glow_directory, JOURNAL_FILENAME)
+        self.entry = caches.read_json(self.path)
+
+    def start(self, command, arguments):
+        self.entry = {"command": command, "arguments": arguments, "done": []}
+        caches.write_json(self.path, self.entry)
+
+    def is_done(self, step_name):
+        return step_name in self.entry["done"]
+
+    def done(self, step_name):
+        self.entry["done"].append(step_name)
+        caches.write_json(self.path, self.entry)
+
+    def clear(self):
+        self.entry = None
+
+        try:
+            os.remove(self.path)
+
+        except FileNotFoundError:
+            pass
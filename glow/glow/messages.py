@@ -1,30 +1,48 @@
-from emoji import emojize
-from termcolor import colored
+_colorama_initialized = False
+
+
+def _emojize(message):
+    from emoji import emojize
+
+    return emojize(message)
+
+
+def _colored(message, *args, **kwargs):
+    global _colorama_initialized
+
+    import colorama
+    from termcolor import colored
+
+    if not _colorama_initialized:
+        colorama.init(autoreset=True)
+        _colorama_initialized = True
+
+    return colored(_emojize(message), *args, **kwargs)
 
 
 def log(message):
-    print(emojize(message))
+    print(_emojize(message))
 
 
 def info(message):
-    print(colored(emojize(message), "blue"))
+    print(_colored(message, "blue"))
 
 
 def success(message):
-    print(colored(emojize(message), "green"))
+    print(_colored(message, "green"))
 
 
 def warning(message):
-    print(colored(emojize(message), "yellow"))
+    print(_colored(message, "yellow"))
 
 
 def error(message):
-    print(colored(emojize(message), "red"))
+    print(_colored(message, "red"))
 
 
 def critical(message):
-    print(colored(emojize(message), "grey", "on_red"))
+    print(_colored(message, "grey", "on_red"))
 
 
 def question(message):
-    return input(colored(emojize(message), "cyan", attrs=["bold"]))
+    return input(_colored(message, "cyan", attrs=["bold"]))
@@ -0,0 +1,133 @@
+import argparse
+import errno
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import messages
+
+
+MULTI_MAX_JOBS = 8
+
+_output_lock = threading.Lock()
+
+
+def parse_args(argv):
+    """Options of multi, anywhere in argv, the rest is the glow command"""
+    parser = argparse.ArgumentParser(
+        prog="git glow multi",
+        description="Run a glow command across repositories",
+        usage="%(prog)s [-h] [-j JOBS] manifest command ...",
+        allow_abbrev=False,
+    )
+    parser.add_argument("manifest", help="file listing a repository per line")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=MULTI_MAX_JOBS,
+        help="number of repositories handled at once",
+    )
+
+    args, command = parser.parse_known_args(argv)
+    args.command = command
+    return args
+
+
+def read_manifest(path):
+    """Repository paths of a manifest, relative to it, # starts comments"""
+    directory = os.path.dirname(os.path.abspath(path))
+    paths = []
+
+    with open(path) as manifest:
+        for line in manifest:
+            line = line.split("#", 1)[0].strip()
+
+            if line:
+                paths.append(
+                    os.path.normpath(
+                        os.path.join(directory, os.path.expanduser(line))
+                    )
+                )
+
+    return paths
+
+
+def _print(prefix, line):
+    with _output_lock:
+        print("{} {}".format(prefix, line.rstrip("\n")))
+
+
+def run_command(path, command, prefix):
+    """Run git glow command in the repository at path, a line at a time
+
+    Confirmations are answered yes, since nobody can type into them.
+    """
+    started = time.perf_counter()
+    environment = dict(os.environ, GLOW_ASSUME_YES="1")
+
+    try:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "glow"] + command,
+            cwd=path,
+            env=environment,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+
+    except OSError as exc:
+        _print(prefix, str(exc))
+        return 1, time.perf_counter() - started
+
+    for line in process.stdout:
+        _print(prefix, line)
+
+    return process.wait(), time.perf_counter() - started
+
+
+def main(argv):
+    args = parse_args(argv)
+
+    if not args.command:
+        messages.critical("No command to run.")
+        sys.exit(1)
+
+    try:
+        paths = read_manifest(args.manifest)
+
+    except OSError as exc:
+        messages.critical("Manifest can't be read: {}".format(exc))
+        sys.exit(errno.ENOENT)
+
+    if not paths:
+        messages.warning("No repository in {}".format(args.manifest))
+        sys.exit(0)
+
+    names = [os.path.basename(path) for path in paths]
+    width = max(len(name) for name in names) + 2
+    prefixes = ["[{}]".format(name).ljust(width) for name in names]
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        results = list(
+            executor.map(
+                lambda path, prefix: run_command(path, args.command, prefix),
+                paths,
+                prefixes,
+            )
+        )
+
+    messages.log("Summary:")
+    for name, (exit_code, duration) in zip(names, results):
+        message = "  {} {:.1f}s".format(name.ljust(width), duration)
+
+        if exit_code == 0:
+            messages.success("{} passed".format(message))
+        else:
+            messages.error("{} failed ({})".format(message, exit_code))
+
+    sys.exit(0 if all(exit_code == 0 for exit_code, _ in results) else 1)
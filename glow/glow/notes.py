@@ -0,0 +1,104 @@
+import os
+
+from . import caches, helpers
+
+
+RELEASE_NOTES_CACHE_FILENAME = "release-notes.json"
+
+
+class ReleaseNotes(object):
+    """Release notes between consecutive version tags
+
+    Notes of a tag range never change, so each one is computed once and
+    cached in the glow directory, keyed by the Jira project key, which
+    groups the changelog, and the commit SHAs of both tags.
+    """
+
+    def __init__(self, repo, jira_project_key, glow_directory):
+        self.repo = repo
+        self.jira_project_key = jira_project_key
+        self.path = os.path.join(glow_directory, RELEASE_NOTES_CACHE_FILENAME)
+        self._entries = None
+        self._tag_commits = None
+        self._dirty = False
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = caches.read_json(self.path, default={})
+        return self._entries
+
+    @property
+    def tag_commits(self):
+        """Commit SHA of every tag, peeling annotated ones"""
+        if self._tag_commits is None:
+            output = self.repo.git.for_each_ref(
+                "--format=%(refname:strip=2) %(objectname) %(*objectname)",
+                "refs/tags",
+            )
+
+            tag_commits = {}
+            for line in output.splitlines():
+                tag_name, object_sha, commit_sha = (line.split(" ") + [""])[:3]
+                tag_commits[tag_name] = commit_sha or object_sha
+
+            self._tag_commits = tag_commits
+
+        return self._tag_commits
+
+    def _changelog(self, revision_range):
+        subjects = helpers.log_subjects(self.repo.git, revision_range)
+        return helpers.build_changelog(subjects, self.jira_project_key)
+
+    def between(self, previous_tag, tag):
+        """Notes of tag, since previous_tag or since the first commit
+
+        Computed notes are kept in memory, save() writes them to the cache.
+        """
+        commit_sha = self.tag_commits[tag]
+
+        if previous_tag is None:
+            revision_range = commit_sha
+
+        else:
+            revision_range = "{}..{}".format(
+                self.tag_commits[previous_tag], commit_sha
+            )
+
+        key = "{} {}".format(self.jira_project_key, revision_range)
+
+        if key not in self.entries:
+            self.entries[key] = self._changelog(revision_range)
+            self._dirty = True
+
+        return self.entries[key]
+
+    def save(self):
+        """Write the cache once, if notes were computed since loaded"""
+        if self._dirty:
+            caches.write_json(self.path, self.entries)
+            self._dirty = False
+
+    def since(self, tag, ref):
+        """Unreleased notes of ref since tag, never cached"""
+        return self._changelog("{}..{}".format(self.tag_commits[tag], ref))
+
+    def release_notes(self, tags, versions=None):
+        """Yield (version, notes) of versions, newest first
+
+        tags are every version tag sorted from the oldest, as returned by
+        Glow._tags(); all of them are used when versions isn't set.
+        versions are yielded in tags order, whatever their order.
+        """
+        positions = {tag: index for index, tag in enumerate(tags)}
+
+        try:
+            for version in sorted(
+                versions or tags, key=positions.__getitem__, reverse=True
+            ):
+                index = positions[version]
+                previous_tag = tags[index - 1] if index else None
+                yield version, self.between(previous_tag, version)
+
+        finally:
+            self.save()
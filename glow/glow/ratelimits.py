@@ -0,0 +1,142 @@
+import fcntl
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from . import caches, messages
+
+
+RATE_LIMIT_FILENAME = "rate-limit.json"
+RATE_LIMIT_RESERVE = 5
+RATE_LIMIT_MAX_WAIT = 120
+
+
+def _header(response, name):
+    try:
+        return int(float(response.headers[name]))
+
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimiter(object):
+    """Github rate limit budget, optionally shared through a file
+
+    Every glow process using the same file sees the latest budget known
+    by any of them, and waits for the reset instead of burning the last
+    calls or hammering the API after a secondary rate limit.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {"remaining": None, "reset": 0, "blocked_until": 0}
+
+    @contextmanager
+    def _locked(self):
+        """Hold the budget for a load-modify-save, across processes too
+
+        The state file is replaced atomically on save, so the lock is taken
+        on a sibling lock file.
+        """
+        with self.lock:
+            if not self.path:
+                yield
+                return
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open("{}.lock".format(self.path), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        if self.path:
+            self.state.update(caches.read_json(self.path, default={}))
+        return self.state
+
+    def _save(self):
+        if self.path:
+            caches.write_json(self.path, self.state)
+
+    def _delay(self, now):
+        state = self._load()
+
+        if state["blocked_until"] > now:
+            return state["blocked_until"] - now
+
+        if (
+            state["remaining"] is not None
+            and state["remaining"] <= RATE_LIMIT_RESERVE
+            and state["reset"] > now
+        ):
+            return state["reset"] - now
+
+        return 0
+
+    def wait(self):
+        """Block until a request fits in the budget, then book it
+
+        Returns the remaining delay, without booking, when the budget is not
+        back within RATE_LIMIT_MAX_WAIT: the request must not be sent then.
+        """
+        with self._locked():
+            delay = self._delay(time.time())
+
+        if delay > RATE_LIMIT_MAX_WAIT:
+            messages.critical(
+                "Github rate limit reached for {:.0f}s more.".format(delay)
+            )
+            return delay
+
+        if delay > 0:
+            messages.warning(
+                "Github rate limit reached, waiting {:.0f}s...".format(delay)
+            )
+            time.sleep(delay)
+
+        with self._locked():
+            self._load()
+
+            if time.time() >= self.state["reset"]:
+                self.state["remaining"] = None
+
+            elif self.state["remaining"]:
+                self.state["remaining"] -= 1
+
+            self._save()
+
+        return 0
+
+    def update(self, response):
+        """Record the budget reported by a response
+
+        Returns True when the response was rate limited and the request
+        can be sent again once the budget allows it.
+        """
+        now = time.time()
+        remaining = _header(response, "X-RateLimit-Remaining")
+        reset = _header(response, "X-RateLimit-Reset")
+        retry_after = _header(response, "Retry-After")
+
+        limited = response.status_code in (403, 429) and (
+            retry_after is not None or remaining == 0
+        )
+
+        with self._locked():
+            self._load()
+
+            if remaining is not None:
+                self.state["remaining"] = remaining
+            if reset is not None:
+                self.state["reset"] = reset
+            if retry_after is not None:
+                self.state["blocked_until"] = now + retry_after
+
+            self._save()
+
+        return limited
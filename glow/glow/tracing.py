@@ -0,0 +1,203 @@
+import json
+import os
+import time
+from collections import Counter
+
+from git import Git, Repo
+from git.exc import GitCommandError
+
+from . import messages
+
+
+calls = Counter()
+records = []
+enabled = False
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def reset():
+    global enabled
+    enabled = False
+
+    calls.clear()
+    del records[:]
+
+
+def record(kind, command, started, size, status):
+    """Count a git process or Github request, and time it when enabled"""
+    calls[kind] += 1
+
+    if enabled:
+        records.append(
+            {
+                "kind": kind,
+                "command": command,
+                "start": started,
+                "duration": time.perf_counter() - started,
+                "bytes": size,
+                "status": status,
+            }
+        )
+
+
+def _output_size(output):
+    if isinstance(output, tuple):
+        output = output[1]
+
+    if isinstance(output, (str, bytes)):
+        return len(output)
+
+    return 0
+
+
+class _CountedStream(object):
+    """Binary stream counting the bytes read through it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.size = 0
+
+    def __iter__(self):
+        for line in self.stream:
+            self.size += len(line)
+            yield line
+
+    def read(self, *args):
+        data = self.stream.read(*args)
+        self.size += len(data)
+        return data
+
+    def readline(self, *args):
+        line = self.stream.readline(*args)
+        self.size += len(line)
+        return line
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class _TracedProcess(object):
+    """git process of an as_process call, recorded once waited on"""
+
+    def __init__(self, process, command, started):
+        self.process = process
+        self.command = command
+        self.started = started
+        self.stdout = _CountedStream(process.stdout)
+
+    def wait(self, *args, **kwargs):
+        status = None
+
+        try:
+            status = self.process.wait(*args, **kwargs)
+            return status
+
+        except GitCommandError as exc:
+            status = exc.status
+            raise
+
+        finally:
+            if self.started is not None:
+                size = self.stdout.size
+                record("git", self.command, self.started, size, status)
+                self.started = None
+
+    def __getattr__(self, name):
+        return getattr(self.process, name)
+
+
+class TracedGit(Git):
+    """Git command wrapper recording every git process it spawns
+
+    Streamed calls (as_process=True) are recorded when waited on, so
+    their duration and size cover the whole output.
+    """
+
+    def execute(self, command, *args, **kwargs):
+        started = time.perf_counter()
+        output, status = None, 0
+
+        command_line = command
+        if not isinstance(command, str):
+            command_line = " ".join(str(part) for part in command)
+
+        try:
+            output = super(TracedGit, self).execute(command, *args, **kwargs)
+            if isinstance(output, tuple):
+                status = output[0]
+
+            if kwargs.get("as_process"):
+                output = _TracedProcess(output, command_line, started)
+                started = None
+
+            return output
+
+        except GitCommandError as exc:
+            status = exc.status
+            raise
+
+        finally:
+            if started is not None:
+                size = _output_size(output)
+                record("git", command_line, started, size, status)
+
+
+class TracedRepo(Repo):
+    GitCommandWrapperType = TracedGit
+
+
+def report():
+    """Print every recorded call, then totals per kind"""
+    messages.info(
+        "{:>10} {:>10} {:>6}  {}".format("ms", "bytes", "status", "command")
+    )
+
+    for entry in records:
+        messages.log(
+            "{:>10.1f} {:>10} {:>6}  {}".format(
+                entry["duration"] * 1000,
+                entry["bytes"],
+                entry["status"],
+                entry["command"],
+            )
+        )
+
+    for kind in sorted(set(entry["kind"] for entry in records)):
+        entries = [entry for entry in records if entry["kind"] == kind]
+        messages.info(
+            "{}: {} calls, {:.1f} ms, {} bytes".format(
+                kind,
+                len(entries),
+                sum(entry["duration"] for entry in entries) * 1000,
+                sum(entry["bytes"] for entry in entries),
+            )
+        )
+
+
+def write_trace(path):
+    """Write records as a Trace Event Format file (chrome://tracing)"""
+    origin = min([entry["start"] for entry in records] or [0])
+    threads = {"git": 1, "http": 2}
+
+    events = [
+        {
+            "name": entry["command"],
+            "cat": entry["kind"],
+            "ph": "X",
+            "ts": (entry["start"] - origin) * 1000000,
+            "dur": entry["duration"] * 1000000,
+            "pid": os.getpid(),
+            "tid": threads.get(entry["kind"], 0),
+            "args": {"bytes": entry["bytes"], "status": entry["status"]},
+        }
+        for entry in records
+    ]
+
+    with open(path, "w") as trace_file:
+        json.dump({"traceEvents": events}, trace_file)
+
+    messages.info("Trace written to {}".format(path))
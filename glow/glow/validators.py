@@ -3,6 +3,10 @@ import sys
 from . import messages
 
 
+FETCH_STRATEGIES = ("full", "blobless", "shallow")
+GITHUB_APIS = ("rest", "graphql")
+
+
 def validate_issue_id(issue_id):
     try:
         issue_id = int(issue_id)
@@ -24,3 +28,27 @@ def validate_method_name(method_name, methods_names):
             "Unknown command «{}»".format(" ".join(method_name.split("_")))
         )
         sys.exit(1)
+
+
+def validate_fetch_strategy(fetch_strategy):
+    if fetch_strategy not in FETCH_STRATEGIES:
+        messages.critical(
+            'Fetch strategy "{}" is not valid, use one of: {}.'.format(
+                fetch_strategy, ", ".join(FETCH_STRATEGIES)
+            )
+        )
+        sys.exit(1)
+
+    return fetch_strategy
+
+
+def validate_github_api(github_api):
+    if github_api not in GITHUB_APIS:
+        messages.critical(
+            'Github API "{}" is not valid, use one of: {}.'.format(
+                github_api, ", ".join(GITHUB_APIS)
+            )
+        )
+        sys.exit(1)
+
+    return github_api
@@ -0,0 +1,89 @@
+import sys
+
+import pytest
+
+from glow.glow import Glow, integrations, tracing
+
+from .github import FakeGithub, git
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv("GIT_{}_NAME".format(role), "Glow")
+        monkeypatch.setenv("GIT_{}_EMAIL".format(role), "glow@example.com")
+
+    for name in ("GLOW_ASSUME_YES", "GLOW_TIMINGS", "GLOW_TRACE"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """Bare origin with master, develop and a first 1.0.0 tag"""
+    path = str(tmp_path / "origin.git")
+    seed = str(tmp_path / "seed")
+
+    git("init", "--bare", "--initial-branch=master", path)
+    git("init", "--initial-branch=master", seed)
+    git("commit", "--allow-empty", "-m", "Initial commit", cwd=seed)
+    git("tag", "1.0.0", cwd=seed)
+    git("branch", "develop", cwd=seed)
+    git("push", path, "master", "develop", "1.0.0", cwd=seed)
+
+    return path
+
+
+@pytest.fixture
+def github(origin, monkeypatch):
+    fake_github = FakeGithub(origin)
+    fake_github.start()
+
+    monkeypatch.setenv("GLOW_GITHUB_API_URL", fake_github.url)
+    integrations.configure()
+
+    yield fake_github
+
+    fake_github.stop()
+    integrations.close_clients()
+    monkeypatch.delenv("GLOW_GITHUB_API_URL")
+    integrations.configure()
+
+
+@pytest.fixture
+def repository(origin, github, tmp_path, monkeypatch):
+    """Clone of origin configured for glow, as working directory"""
+    path = str(tmp_path / "repository")
+
+    git("clone", origin, path)
+    git("checkout", "develop", cwd=path)
+    git("config", "glow.github-token", "token", cwd=path)
+    git("config", "glow.github-repository-name", "owner/name", cwd=path)
+    git("config", "glow.jira-project-key", "GLOW", cwd=path)
+
+    monkeypatch.chdir(path)
+    return path
+
+
+@pytest.fixture
+def run_glow(repository, github, monkeypatch):
+    """Run a glow command in-process, return its exit code and call counts"""
+
+    def run(*argv):
+        monkeypatch.setattr(
+            sys, "argv", ["git-glow", *argv, "--yes", "--no-cache"]
+        )
+        tracing.reset()
+        del github.requests[:]
+
+        try:
+            Glow().main()
+            exit_code = 0
+
+        except SystemExit as exc:
+            exit_code = exc.code
+
+        return exit_code, dict(tracing.calls)
+
+    return run
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import re
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def git(*args, cwd=None):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+class FakeGithub(object):
+    """Github API stand-in backed by a bare repository
+
+    Implements the endpoints glow.integrations uses, and records every
+    request as (method, path) in requests. GET responses carry an ETag,
+    requests revalidated with a 304 are recorded in not_modified too.
+    """
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.requests = []
+        self.not_modified = []
+        self.pull_requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.github = self
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def refs(self, prefix="refs/"):
+        output = git(
+            "-C",
+            self.origin,
+            "for-each-ref",
+            "--format=%(refname) %(objectname)",
+            prefix,
+        )
+        return dict(line.split(" ") for line in output.splitlines())
+
+    def object(self, revision):
+        return {
+            "type": git("-C", self.origin, "cat-file", "-t", revision),
+            "sha": git("-C", self.origin, "rev-parse", revision),
+        }
+
+    def handle(self, method, path, payload):
+        self.requests.append((method, path))
+
+        if method == "POST" and path == "/graphql":
+            return self.graphql(payload["variables"])
+
+        match = re.match(r"/repos/[^/]+/[^/]+/(.*)$", path)
+        if match is None:
+            return 404, {"message": "Not Found"}
+
+        endpoint = match.group(1)
+        refs = self.refs()
+
+        if method == "GET" and endpoint.startswith("branches/"):
+            ref = "refs/heads/{}".format(endpoint.split("/", 1)[1])
+            if ref not in refs:
+                return 404, {"message": "Branch not found"}
+            return 200, {"commit": {"sha": refs[ref]}}
+
+        if method == "GET" and endpoint.startswith("git/matching-refs/"):
+            prefix = "refs/{}".format(endpoint.split("/", 2)[2])
+            return 200, [
+                {"ref": ref, "object": {"sha": sha}}
+                for ref, sha in sorted(refs.items())
+                if ref.startswith(prefix)
+            ]
+
+        if method == "GET" and endpoint.startswith("git/ref/"):
+            ref = "refs/{}".format(endpoint.split("/", 2)[2])
+            if ref not in refs:
+                return 404, {"message": "Not Found"}
+            return 200, {"ref": ref, "object": self.object(refs[ref])}
+
+        if method == "GET" and endpoint.startswith("git/tags/"):
+            tag_sha = endpoint.split("/", 2)[2]
+            return 200, {"object": self.object("{}^{{}}".format(tag_sha))}
+
+        if method == "POST" and endpoint == "git/refs":
+            if payload["ref"] in refs:
+                return 422, {"message": "Reference already exists"}
+            git("-C", self.origin, "update-ref", payload["ref"], payload["sha"])
+            return 201, {"ref": payload["ref"]}
+
+        if method == "DELETE" and endpoint.startswith("git/refs/"):
+            ref = "refs/{}".format(endpoint.split("/", 2)[2])
+            if ref not in refs:
+                return 422, {"message": "Reference does not exist"}
+            git("-C", self.origin, "update-ref", "-d", ref)
+            return 204, None
+
+        if method == "POST" and endpoint == "pulls":
+            payload["html_url"] = "https://github.test/pull/{}".format(
+                len(self.pull_requests) + 1
+            )
+            self.pull_requests.append(payload)
+            return 201, {"html_url": payload["html_url"]}
+
+        if method == "POST" and endpoint == "merges":
+            return self.merge(refs, payload)
+
+        return 404, {"message": "Not Found"}
+
+    def graphql(self, variables):
+        """Answer repository_state queries, from their variables only"""
+        refs = self.refs()
+        repository = {}
+
+        for name, value in variables.items():
+            if name.startswith("branch"):
+                repository[name] = (
+                    {"target": {"oid": refs[value]}} if value in refs else None
+                )
+
+            elif name.startswith("head"):
+                index = name.replace("head", "", 1)
+                base = variables["base{}".format(index)]
+                repository["pull{}".format(index)] = {
+                    "nodes": [
+                        {"url": pull_request["html_url"]}
+                        for pull_request in self.pull_requests
+                        if pull_request["head"] == value
+                        and pull_request["base"] == base
+                    ]
+                }
+
+        return 200, {"data": {"repository": repository}}
+
+    def merge(self, refs, payload):
+        base = "refs/heads/{}".format(payload["base"])
+        head = "refs/heads/{}".format(payload["head"])
+
+        is_merged = subprocess.run(
+            ["git", "-C", self.origin, "merge-base", "--is-ancestor"]
+            + [refs[head], refs[base]]
+        )
+        if is_merged.returncode == 0:
+            return 204, None
+
+        tree = subprocess.run(
+            ["git", "-C", self.origin, "merge-tree", "--write-tree"]
+            + [refs[base], refs[head]],
+            capture_output=True,
+            text=True,
+        )
+        if tree.returncode:
+            return 409, {"message": "Merge conflict"}
+
+        commit_sha = git(
+            "-C",
+            self.origin,
+            "commit-tree",
+            tree.stdout.split()[0],
+            "-p",
+            refs[base],
+            "-p",
+            refs[head],
+            "-m",
+            payload["commit_message"],
+        )
+        git("-C", self.origin, "update-ref", base, commit_sha)
+        return 201, {"sha": commit_sha}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or "null")
+
+        status, content = self.server.github.handle(
+            self.command, self.path, payload
+        )
+
+        body = b"" if content is None else json.dumps(content).encode()
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+
+        if self.command == "GET" and status == 200:
+            if self.headers.get("If-None-Match") == etag:
+                self.server.github.not_modified.append(self.path)
+                status, body = 304, b""
+
+        self.send_response(status)
+        if self.command == "GET" and status in (200, 304):
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
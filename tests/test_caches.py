@@ -0,0 +1,24 @@
+from glow.glow import integrations
+
+from .github import git
+
+
+def test_revalidated_lookups_replay_the_cache(github, tmp_path, monkeypatch):
+    monkeypatch.setattr(integrations, "_response_cache", None)
+    integrations.enable_cache(str(tmp_path))
+    develop_sha = github.refs()["refs/heads/develop"]
+
+    for _ in range(2):
+        assert (
+            integrations.branch_exists("token", "owner/name", "develop")
+            == develop_sha
+        )
+    assert github.not_modified == ["/repos/owner/name/branches/develop"]
+
+    # Room for two entries: the least recently used one is evicted
+    git("-C", github.origin, "branch", "other", "develop")
+    integrations._response_cache.max_bytes = 150
+    for branch_name in ("master", "develop", "other", "develop", "master"):
+        integrations.branch_exists("token", "owner/name", branch_name)
+
+    assert github.not_modified == ["/repos/owner/name/branches/develop"] * 3
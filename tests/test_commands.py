@@ -0,0 +1,344 @@
+"""End-to-end commands against a bare origin and a fake Github
+
+Every command asserts the exact number of git processes and Github
+requests it needs, so an extra round trip fails the build.
+"""
+
+import json
+import os
+import sys
+from contextlib import nullcontext
+
+import pytest
+from git.exc import GitCommandError
+
+from glow.glow import Glow, helpers, integrations, tracing
+
+from .github import git
+
+
+def requests_of(github):
+    return sorted(github.requests)
+
+
+def test_feature(run_glow, repository, github):
+    assert run_glow("start", "feature", "1") == (0, {"git": 3, "http": 3})
+    assert requests_of(github) == [
+        ("GET", "/repos/owner/name/branches/develop"),
+        ("GET", "/repos/owner/name/branches/feature/GLOW-1"),
+        ("POST", "/repos/owner/name/git/refs"),
+    ]
+    assert git("branch", "--show-current", cwd=repository) == "feature/GLOW-1"
+
+    git("commit", "--allow-empty", "-m", "GLOW-1 Work", cwd=repository)
+    git("push", "origin", "feature/GLOW-1", cwd=repository)
+
+    assert run_glow("review", "feature", "1") == (0, {"git": 6, "http": 2})
+    assert requests_of(github) == [
+        ("GET", "/repos/owner/name/branches/feature/GLOW-1"),
+        ("POST", "/repos/owner/name/pulls"),
+    ]
+    pull_request = github.pull_requests[-1]
+    assert (pull_request["head"], pull_request["base"]) == (
+        "feature/GLOW-1",
+        "develop",
+    )
+    assert "GLOW-1 Work" in pull_request["body"]
+
+    assert run_glow("finish", "feature", "1") == (0, {"git": 6, "http": 1})
+    assert "refs/heads/feature/GLOW-1" not in github.refs()
+    assert "feature/GLOW-1" not in git("branch", cwd=repository)
+
+
+def test_review_with_graphql(run_glow, repository, github):
+    git("config", "glow.github-api", "graphql", cwd=repository)
+    assert run_glow("start", "feature", "1")[0] == 0
+    git("commit", "--allow-empty", "-m", "Work", cwd=repository)
+
+    assert run_glow("review", "feature", "1")[0] == 0
+    assert requests_of(github) == [
+        ("POST", "/graphql"),
+        ("POST", "/repos/owner/name/pulls"),
+    ]
+
+    # The pull request already open is reported, not created again
+    assert run_glow("review", "feature", "1") == (0, {"git": 5, "http": 1})
+    assert github.requests == [("POST", "/graphql")]
+    assert len(github.pull_requests) == 1
+
+
+def test_several_features(run_glow, github):
+    assert run_glow("start", "feature", "1", "2", "3") == (
+        0,
+        {"git": 2, "http": 7},
+    )
+    assert run_glow("finish", "feature", "1", "2", "3") == (
+        0,
+        {"git": 5, "http": 3},
+    )
+    assert not github.refs("refs/heads/feature/")
+
+
+def test_review_aborts_failed_rebase(run_glow, repository, github):
+    """Clean as a merge, the first commit conflicts once replayed"""
+
+    def commit(content):
+        with open("file.txt", "w") as text_file:
+            text_file.write(content)
+        git("commit", "-am", content, cwd=repository)
+
+    with open("file.txt", "w") as text_file:
+        text_file.write("base")
+    git("add", "file.txt", cwd=repository)
+    git("commit", "-m", "base", cwd=repository)
+    git("push", "origin", "develop", cwd=repository)
+    assert run_glow("start", "feature", "1", "2")[0] == 0
+
+    git("checkout", "feature/GLOW-1", cwd=repository)
+    commit("feature")
+    commit("base")
+
+    git("checkout", "develop", cwd=repository)
+    commit("develop")
+    git("push", "origin", "develop", cwd=repository)
+    git("checkout", "feature/GLOW-1", cwd=repository)
+    feature_sha = git("rev-parse", "HEAD", cwd=repository)
+
+    assert run_glow("review", "feature", "1", "2")[0] == 1
+    assert git("status", "--porcelain", cwd=repository) == ""
+    assert git("rev-parse", "HEAD", cwd=repository) == feature_sha
+    assert [pull_request["head"] for pull_request in github.pull_requests] == [
+        "feature/GLOW-2"
+    ]
+
+
+def test_release(run_glow, repository, github):
+    assert run_glow("start", "release") == (0, {"git": 6, "http": 4})
+    assert requests_of(github) == [
+        ("GET", "/repos/owner/name/branches/develop"),
+        ("GET", "/repos/owner/name/branches/hotfix/1.0.1"),
+        ("GET", "/repos/owner/name/branches/release/1.1.0"),
+        ("POST", "/repos/owner/name/git/refs"),
+    ]
+
+    git("commit", "--allow-empty", "-m", "Release fix", cwd=repository)
+    git("push", "origin", "release/1.1.0", cwd=repository)
+
+    assert run_glow("review", "release") == (0, {"git": 7, "http": 2})
+    assert github.pull_requests[-1]["base"] == "master"
+
+    assert run_glow("finish", "release") == (0, {"git": 9, "http": 1})
+    refs = github.refs()
+    assert refs["refs/tags/1.1.0"] == refs["refs/heads/master"]
+    assert "refs/heads/release/1.1.0" not in refs
+    assert "Release fix" in git("log", "--format=%s", "develop", cwd=repository)
+
+
+def test_hotfix(run_glow, repository, github):
+    assert run_glow("start", "hotfix") == (0, {"git": 5, "http": 3})
+
+    git("commit", "--allow-empty", "-m", "Hotfix", cwd=repository)
+    git("push", "origin", "hotfix/1.0.1", cwd=repository)
+
+    assert run_glow("review", "hotfix") == (0, {"git": 7, "http": 2})
+    assert github.pull_requests[-1]["base"] == "master"
+
+    assert run_glow("finish", "hotfix") == (0, {"git": 9, "http": 1})
+    refs = github.refs()
+    assert "refs/tags/1.0.1" in refs
+    assert "refs/heads/hotfix/1.0.1" not in refs
+
+
+def test_resume_interrupted_finish(run_glow, repository, github):
+    assert run_glow("start", "release")[0] == 0
+    git("commit", "--allow-empty", "-m", "Release", cwd=repository)
+    git("push", "origin", "release/1.1.0", cwd=repository)
+
+    git("remote", "set-url", "--push", "origin", "/missing", cwd=repository)
+    with pytest.raises(GitCommandError):
+        run_glow("finish", "release")
+
+    journal_path = os.path.join(repository, ".git", "glow", "journal.json")
+    with open(journal_path) as journal_file:
+        journal = json.load(journal_file)
+    assert journal["command"] == "finish_release"
+    assert journal["done"] == ["checkout", "pull", "tag", "merge", "delete"]
+
+    assert run_glow("finish", "hotfix") == (1, {"git": 1})
+
+    git("remote", "set-url", "--push", "origin", github.origin, cwd=repository)
+    # The repository lookup, then the push, nothing pulled or merged again
+    assert run_glow("resume") == (0, {"git": 2})
+    refs = github.refs()
+    assert "refs/tags/1.1.0" in refs
+    assert "refs/heads/release/1.1.0" not in refs
+    assert refs["refs/heads/develop"] == git(
+        "rev-parse", "develop", cwd=repository
+    )
+    assert not os.path.exists(journal_path)
+
+
+def test_missing_branch(run_glow):
+    assert run_glow("finish", "release") == (1, {"git": 2})
+
+
+def test_remote_finish(run_glow, repository, github, monkeypatch):
+    assert run_glow("start", "hotfix")[0] == 0
+    git("commit", "--allow-empty", "-m", "Hotfix", cwd=repository)
+    git("push", "origin", "hotfix/1.0.1", cwd=repository)
+
+    monkeypatch.setenv("GLOW_GITHUB_TOKEN", "token")
+    monkeypatch.setenv("GLOW_GITHUB_REPOSITORY_NAME", "owner/name")
+    monkeypatch.setattr(Glow, "_init_repo", None)
+
+    assert run_glow("finish", "hotfix", "--remote") == (0, {"http": 5})
+    refs = github.refs()
+    assert "refs/tags/1.0.1" in refs
+    assert "refs/heads/hotfix/1.0.1" not in refs
+
+
+def test_remote_finish_checks_existing_tag(
+    run_glow, repository, github, monkeypatch
+):
+    assert run_glow("start", "hotfix")[0] == 0
+    git("commit", "--allow-empty", "-m", "Hotfix", cwd=repository)
+    git("push", "origin", "hotfix/1.0.1", cwd=repository)
+    hotfix_sha = git("rev-parse", "HEAD", cwd=repository)
+    git("-C", github.origin, "tag", "1.0.1", hotfix_sha)
+
+    monkeypatch.setenv("GLOW_GITHUB_TOKEN", "token")
+    monkeypatch.setenv("GLOW_GITHUB_REPOSITORY_NAME", "owner/name")
+    monkeypatch.setattr(Glow, "_init_repo", None)
+
+    assert run_glow("finish", "hotfix", "--remote") == (1, {"http": 4})
+    assert "refs/heads/hotfix/1.0.1" in github.refs()
+
+    git(
+        "-C", github.origin, "tag", "-f", "-a", "-m", "1.0.1", "1.0.1", "master"
+    )
+    assert run_glow("finish", "hotfix", "--remote") == (0, {"http": 7})
+    assert "refs/heads/hotfix/1.0.1" not in github.refs()
+
+    git("-C", github.origin, "branch", "-m", "master", "main")
+    git("-C", github.origin, "branch", "hotfix/1.0.2", "develop")
+    assert run_glow("finish", "hotfix", "--remote") == (1, {"http": 2})
+    assert "refs/tags/1.0.2" not in github.refs()
+
+
+def test_commands_sharing_an_instance(repository, github, monkeypatch):
+    """As a daemon runs them, each with its own options and environment"""
+    glow = Glow()
+
+    def run(*argv):
+        monkeypatch.setattr(sys, "argv", ["git-glow", *argv, "--yes"])
+        with pytest.raises(SystemExit) if "--remote" in argv else nullcontext():
+            glow.main()
+
+    run("status")
+    assert integrations._response_cache is not None
+    assert glow.github_repository_name == "owner/name"
+
+    run("status", "--no-cache")
+    assert integrations._response_cache is None
+
+    monkeypatch.setenv("GLOW_GITHUB_TOKEN", "token")
+    monkeypatch.setenv("GLOW_GITHUB_REPOSITORY_NAME", "remote/name")
+    run("finish", "hotfix", "--remote")
+    assert github.requests[-1][1].startswith("/repos/remote/name/")
+
+    run("status")
+    assert glow.github_repository_name == "owner/name"
+
+
+def merge_feature(repository, issue_id):
+    """Commit on a feature, then merge it into develop as Github does"""
+    branch_name = "feature/GLOW-{}".format(issue_id)
+
+    git("checkout", "-b", branch_name, "develop", cwd=repository)
+    git("commit", "--allow-empty", "-m", "Work", cwd=repository)
+    git("checkout", "develop", cwd=repository)
+    git("merge", "--no-ff", "-m", "Merge", branch_name, cwd=repository)
+    git("push", "origin", "develop", branch_name, cwd=repository)
+
+
+def test_prune_features(run_glow, repository, github):
+    merge_feature(repository, 1)
+    merge_feature(repository, 2)
+    git("branch", "-D", "feature/GLOW-2", cwd=repository)
+    assert run_glow("start", "feature", "3")[0] == 0
+    git("checkout", "develop", cwd=repository)
+
+    assert run_glow("prune", "features", "--dry-run") == (0, {"git": 6})
+    assert set(github.refs("refs/heads/feature/")) == {
+        "refs/heads/feature/GLOW-1",
+        "refs/heads/feature/GLOW-2",
+        "refs/heads/feature/GLOW-3",
+    }
+
+    assert run_glow("prune", "features") == (0, {"git": 8})
+    assert list(github.refs("refs/heads/feature/")) == [
+        "refs/heads/feature/GLOW-3"
+    ]
+    assert git("branch", "--list", "feature/*", cwd=repository).split() == [
+        "feature/GLOW-3"
+    ]
+
+
+def test_prune_features_keeps_new_remote_work(
+    run_glow, repository, github, monkeypatch
+):
+    merge_feature(repository, 1)
+    other = git("rev-parse", "develop", cwd=repository)
+
+    def push_meanwhile(question):
+        git(
+            "-C",
+            github.origin,
+            "update-ref",
+            "refs/heads/feature/GLOW-1",
+            git(
+                "-C",
+                github.origin,
+                "commit-tree",
+                "-p",
+                other,
+                "-m",
+                "New",
+                other + "^{tree}",
+            ),
+        )
+
+    monkeypatch.setattr(helpers, "ask", push_meanwhile)
+
+    with pytest.raises(GitCommandError):
+        run_glow("prune", "features")
+
+    assert "refs/heads/feature/GLOW-1" in github.refs()
+
+
+def test_status_counts(run_glow, repository, github):
+    assert run_glow("start", "feature", "1", "2")[0] == 0
+    assert run_glow("start", "hotfix")[0] == 0
+    git("commit", "--allow-empty", "-m", "Hotfix", cwd=repository)
+
+    git("checkout", "feature/GLOW-1", cwd=repository)
+    for message in ("One", "Two"):
+        git("commit", "--allow-empty", "-m", message, cwd=repository)
+    git("branch", "-D", "feature/GLOW-2", cwd=repository)
+
+    git("checkout", "develop", cwd=repository)
+    git("commit", "--allow-empty", "-m", "Develop", cwd=repository)
+    git("fetch", cwd=repository)
+
+    glow = Glow()
+    has_ahead_behind = glow.repo.git.version_info >= (2, 41)
+    tracing.reset()
+    statuses = glow._branch_statuses()
+
+    assert statuses == [
+        ("feature/GLOW-1", "develop", 2, 1, "origin"),
+        ("feature/GLOW-2", "develop", 0, 1, "remote only"),
+        ("hotfix/1.0.1", "master", 1, 0, "origin"),
+    ]
+    # Refs with their counts, or refs, merge base and a single walk
+    assert tracing.calls["git"] == (1 if has_ahead_behind else 3)
@@ -0,0 +1,33 @@
+import pytest
+
+from glow.glow import helpers
+
+
+@pytest.mark.parametrize("subject", ["GLOW-{} Fix", "Fix number {}"])
+@pytest.mark.parametrize("max_length", [200, 60000, 65536])
+def test_changelog_fits_in_budget(subject, max_length):
+    subjects = (subject.format(index) for index in range(20000))
+
+    changelog = helpers.build_changelog(subjects, "GLOW", max_length)
+
+    assert len(changelog) <= max_length
+    assert changelog.endswith("more commits_")
+
+
+def test_changelog_groups_and_deduplicates():
+    subjects = ["GLOW-1 First", "Chore", "glow-1 First", "GLOW-2 Second"]
+    subjects.append("GLOW-1 First")
+
+    assert helpers.build_changelog(subjects, "GLOW") == "\n".join(
+        [
+            "**GLOW-1**",
+            "- GLOW-1 First",
+            "- glow-1 First",
+            "",
+            "**GLOW-2**",
+            "- GLOW-2 Second",
+            "",
+            "**Other changes**",
+            "- Chore",
+        ]
+    )
@@ -0,0 +1,25 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from glow.glow import integrations
+
+
+class SlowClient(object):
+    created = []
+
+    def __init__(self, github_token):
+        time.sleep(0.05)
+        self.created.append(self)
+
+    def close(self):
+        pass
+
+
+def test_concurrent_lookups_share_one_client(monkeypatch):
+    monkeypatch.setattr(integrations, "GithubClient", SlowClient)
+    monkeypatch.setattr(integrations, "_clients", {})
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        clients = set(executor.map(integrations.get_client, ["token"] * 4))
+
+    assert len(clients) == len(SlowClient.created) == 1
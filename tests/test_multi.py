@@ -0,0 +1,19 @@
+import pytest
+
+from glow.glow import multi
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        "-j 2 services.txt start release --yes",
+        "services.txt -j 2 start release --yes",
+        "services.txt start release --yes --jobs 2",
+    ],
+)
+def test_jobs_anywhere(argv):
+    args = multi.parse_args(argv.split())
+
+    assert args.manifest == "services.txt"
+    assert args.jobs == 2
+    assert args.command == ["start", "release", "--yes"]
@@ -0,0 +1,61 @@
+from git import Repo
+
+from glow.glow import caches
+from glow.glow.notes import ReleaseNotes
+
+from .github import git
+
+
+def test_release_notes_newest_first_per_project(tmp_path):
+    path = str(tmp_path / "repository")
+    glow_directory = str(tmp_path / "glow")
+
+    git("init", path)
+    for version, subject in [("1.0.0", "Initial"), ("1.1.0", "GLOW-1 One")]:
+        git("commit", "--allow-empty", "-m", subject, cwd=path)
+        git("tag", version, cwd=path)
+    git("commit", "--allow-empty", "-m", "OTHER-2 Two", cwd=path)
+    git("tag", "1.2.0", cwd=path)
+
+    repo = Repo(path)
+    tags = ["1.0.0", "1.1.0", "1.2.0"]
+
+    glow_notes = ReleaseNotes(repo, "GLOW", glow_directory)
+    assert list(glow_notes.release_notes(tags, ["1.1.0", "1.2.0"])) == [
+        ("1.2.0", "**Other changes**\n- OTHER-2 Two"),
+        ("1.1.0", "**GLOW-1**\n- GLOW-1 One"),
+    ]
+
+    other_notes = ReleaseNotes(repo, "OTHER", glow_directory)
+    assert list(other_notes.release_notes(tags, ["1.2.0"])) == [
+        ("1.2.0", "**OTHER-2**\n- OTHER-2 Two"),
+    ]
+
+
+def test_release_notes_cache_written_once(tmp_path, monkeypatch):
+    path = str(tmp_path / "repository")
+    git("init", path)
+    for index in range(5):
+        git(
+            "commit",
+            "--allow-empty",
+            "-m",
+            "GLOW-{} Fix".format(index),
+            cwd=path,
+        )
+        git("tag", "1.{}.0".format(index), cwd=path)
+
+    writes = []
+    write_json = caches.write_json
+    monkeypatch.setattr(
+        caches,
+        "write_json",
+        lambda *args: writes.append(args[0]) or write_json(*args),
+    )
+    tags = ["1.{}.0".format(index) for index in range(5)]
+
+    # Once for every tag, then not at all when everything is cached
+    for _ in range(2):
+        release_notes = ReleaseNotes(Repo(path), "GLOW", str(tmp_path / "glow"))
+        assert len(list(release_notes.release_notes(tags))) == 5
+        assert len(writes) == 1
@@ -0,0 +1,47 @@
+import multiprocessing
+import time
+
+from glow.glow import caches, integrations, ratelimits
+
+
+def book(path, count):
+    rate_limiter = ratelimits.RateLimiter(path)
+    for _ in range(count):
+        rate_limiter.wait()
+
+
+def test_budget_is_shared_without_lost_updates(tmp_path):
+    path = str(tmp_path / ratelimits.RATE_LIMIT_FILENAME)
+    reset = time.time() + 3600
+    caches.write_json(
+        path, {"remaining": 1000, "reset": reset, "blocked_until": 0}
+    )
+
+    processes = [
+        multiprocessing.Process(target=book, args=(path, 50)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert caches.read_json(path)["remaining"] == 800
+
+
+def test_request_fails_fast_beyond_max_wait(github, tmp_path, monkeypatch):
+    rate_limiter = ratelimits.RateLimiter()
+    rate_limiter.state["blocked_until"] = (
+        time.time() + ratelimits.RATE_LIMIT_MAX_WAIT * 2
+    )
+    monkeypatch.setattr(integrations, "_rate_limiter", rate_limiter)
+
+    response = integrations.get_client("token").get("/repos/owner/name")
+    assert response.status_code == 429
+
+    status_code, errors = integrations.create_pull_request(
+        "token", "owner/name", "feature/GLOW-1", "develop", "Title", "Body"
+    )
+    assert status_code == 429
+    assert errors[0].startswith("Github rate limit reached, retry in ")
+
+    assert github.requests == []
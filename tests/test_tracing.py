@@ -0,0 +1,24 @@
+from glow.glow import helpers, tracing
+
+from .github import git
+
+
+def test_streamed_call_recorded_once_waited(tmp_path):
+    path = str(tmp_path / "repository")
+    git("init", path)
+    for subject in ("First", "Second"):
+        git("commit", "--allow-empty", "-m", subject, cwd=path)
+
+    repo = tracing.TracedRepo(path)
+    tracing.reset()
+    tracing.enable()
+
+    subjects = helpers.log_subjects(repo.git, "HEAD")
+    assert next(subjects) == "Second\n"
+    assert tracing.records == []
+
+    assert list(subjects) == ["First"]
+    assert [
+        (entry["command"], entry["bytes"]) for entry in tracing.records
+    ] == [("git log HEAD --pretty=format:%s", len("Second\nFirst"))]
+    tracing.reset()